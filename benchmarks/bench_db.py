@@ -0,0 +1,90 @@
+"""
+Database write throughput of the crawl's batch writer against a local Postgres.
+
+Builds bids from the listing fixtures with the evaluations recorded for the result view
+fixtures (the same mix the mock server serves), then writes them through BidBatchWriter
+twice: once as new rows, once as updates of the same rows. Bid and seller participation
+rows per second are reported for both passes.
+
+The database comes from DB_HOST/DB_NAME/DB_USER/DB_PASSWORD/DB_PORT as for a crawl; use a
+scratch database. Mock bids (ids from 90000000) are deleted before and after the run.
+
+Usage:
+    python benchmarks/bench_db.py [--bids 5000] [--batch-size N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_pipeline import delete_mock_bids
+from mock_gem_server import PARENT_RESULT_VIEW, RESULT_VIEW_FIXTURES, RESULT_VIEW_MIX, build_bids, load_listing_docs
+from working import BidBatchWriter, GeMBidScraper
+
+
+def load_evaluations() -> dict:
+    """Recorded parse output of each result view fixture, by name"""
+    evaluations = {}
+    for name in list(RESULT_VIEW_MIX) + [PARENT_RESULT_VIEW]:
+        with open(os.path.join(RESULT_VIEW_FIXTURES, name + ".json"), encoding="utf-8") as f:
+            evaluations[name] = json.load(f)
+    return evaluations
+
+
+def build_bid_infos(scraper: GeMBidScraper, count: int) -> list:
+    evaluations = load_evaluations()
+    mix = [name for name, share in RESULT_VIEW_MIX.items() for _ in range(share)]
+    bid_infos = []
+    for _, doc in build_bids(count, 10, load_listing_docs()):
+        bid_info = scraper.extract_bid_info(doc)
+        bid_info["evaluation_data"] = evaluations[mix[int(bid_info["id"]) % len(mix)]]
+        if bid_info.get("b_id_parent"):
+            bid_info["parent_evaluation_data"] = evaluations[PARENT_RESULT_VIEW]
+        bid_infos.append(bid_info)
+    return bid_infos
+
+
+def write_all(scraper: GeMBidScraper, bid_infos: list, batch_size: int):
+    """Write every bid in batches, returns (saved rows, failed rows, seconds)"""
+    writer = BidBatchWriter(scraper, batch_size, flush_interval=float("inf"))
+    saved = failed = 0
+    started = time.perf_counter()
+    for bid_info in bid_infos:
+        writer.add(bid_info)
+        if writer.should_flush():
+            ok, failures = writer.flush()
+            saved, failed = saved + len(ok), failed + len(failures)
+    ok, failures = writer.flush()
+    return saved + len(ok), failed + len(failures), time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database write throughput of the batch writer")
+    parser.add_argument("--bids", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, help="rows per statement (default DB_BATCH_SIZE)")
+    args = parser.parse_args()
+
+    scraper = GeMBidScraper()
+    batch_size = args.batch_size or scraper.db_batch_size
+    bid_infos = build_bid_infos(scraper, args.bids)
+    sellers = sum(len(scraper.build_participation_rows(bid_info["id"], bid_info.get("evaluation_data"),
+                                                       bid_info.get("parent_evaluation_data")))
+                  for bid_info in bid_infos)
+
+    delete_mock_bids(scraper, args.bids)
+    try:
+        print(f"{len(bid_infos)} bids with {sellers} seller participations, batches of {batch_size}"
+              f"{', partitioned table' if scraper.partitioned_table else ''}")
+        for label in ("insert", "update"):
+            saved, failed, seconds = write_all(scraper, bid_infos, batch_size)
+            print(f"  {label}: {saved} rows in {seconds:.2f}s, {saved / seconds:8.1f} bids/sec, "
+                  f"{sellers / seconds:9.1f} participations/sec" + (f", {failed} failed" if failed else ""))
+    finally:
+        delete_mock_bids(scraper, args.bids)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Result view parse time per page, for each parser backend.
+
+Parses every saved result view page of a corpus (the fixtures by default) with the lxml and
+BeautifulSoup backends and prints the mean time per page, without network or database.
+
+Usage:
+    python benchmarks/bench_parse.py [corpus_dir] [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from working import GeMBidScraper
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "result_views")
+BACKENDS = ("lxml", "bs4")
+
+
+def per_page_ms(scraper: GeMBidScraper, html_content: str, name: str, backend: str, repeat: int) -> float:
+    seconds = timeit.timeit(lambda: scraper.parse_result_view_html(html_content, name, parser_backend=backend),
+                            number=repeat)
+    return seconds / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Result view parse time per page")
+    parser.add_argument("corpus_dir", nargs="?", default=FIXTURES)
+    parser.add_argument("--repeat", type=int, default=50, help="parses of each page per backend")
+    args = parser.parse_args()
+
+    scraper = GeMBidScraper(init_database=False)
+    pages = []
+    for name in sorted(os.listdir(args.corpus_dir)):
+        if name.endswith(".html"):
+            with open(os.path.join(args.corpus_dir, name), encoding="utf-8") as f:
+                pages.append((name, f.read()))
+
+    totals = dict.fromkeys(BACKENDS, 0.0)
+    print(f"{'page':<36} {'KB':>6} " + " ".join(f"{backend + ' ms':>9}" for backend in BACKENDS))
+    for name, html_content in pages:
+        times = {backend: per_page_ms(scraper, html_content, name, backend, args.repeat) for backend in BACKENDS}
+        for backend, ms in times.items():
+            totals[backend] += ms
+        print(f"{name:<36} {len(html_content) / 1024:>6.1f} " + " ".join(f"{times[b]:>9.3f}" for b in BACKENDS))
+
+    print(f"\nmean over {len(pages)} pages:")
+    for backend in BACKENDS:
+        mean = totals[backend] / max(len(pages), 1)
+        print(f"  {backend:<5} {mean:8.3f} ms/page ({1000 / mean if mean else 0:,.0f} pages/sec per process)")
+
+
+if __name__ == "__main__":
+    main()
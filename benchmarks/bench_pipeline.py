@@ -0,0 +1,215 @@
+"""
+End-to-end crawl benchmark against the local mock GeM server and a local Postgres.
+
+Starts benchmarks/mock_gem_server.py, crawls every listing page it serves through the real
+pipeline (listing -> result views -> parse workers -> database) and reports bids/sec, parse
+time per result view page and database rows/sec. Request rate limits and the result view
+cache are off so the numbers measure the crawler, not the politeness budget or the disk.
+
+The database comes from DB_HOST/DB_NAME/DB_USER/DB_PASSWORD/DB_PORT as for a crawl; use a
+scratch database. Mock bids (ids from 90000000) are deleted before each run.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--bids 2000] [--latency-ms 50] [--jitter-ms 20]
+        [--error-rate 0.0] [--concurrency N] [--parse-workers N] [--backend lxml|bs4]
+        [--save results.json] [--baseline results.json] [--tolerance 0.1]
+
+--baseline compares with a saved run and exits with 1 when a figure regressed by more than
+--tolerance (a share, 0.1 = 10%).
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_gem_server import mock_bid_id
+from working import LATENCY_BUCKETS, AdaptiveRateLimiter, DEFAULT_RATE_LIMITS, GeMBidScraper
+
+MOCK_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_gem_server.py")
+
+# Reported figures and whether a higher value is better
+FIGURES = {
+    "bids_per_sec": True,
+    "parse_ms_per_page": False,
+    "parse_p95_ms": False,
+    "db_rows_per_sec": True
+}
+
+
+def start_mock_server(args) -> subprocess.Popen:
+    """Run the mock server in its own process and wait until it listens"""
+    server = subprocess.Popen([sys.executable, MOCK_SERVER, "--port", str(args.port), "--bids", str(args.bids),
+                               "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+                               "--error-rate", str(args.error_rate)], stdout=subprocess.PIPE, text=True)
+    if not server.stdout.readline():
+        server.wait()
+        raise RuntimeError(f"mock server did not start on port {args.port} (exit code {server.returncode})")
+    return server
+
+
+def mock_stats(port: int) -> dict:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/stats", timeout=2) as response:
+        return json.load(response)
+
+
+def delete_mock_bids(scraper, count: int):
+    """Drop rows left by earlier runs so every run measures inserts"""
+    bid_ids = [mock_bid_id(index) for index in range(count)]
+
+    def delete(conn):
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM bid_participations WHERE bid_id = ANY(%s)", (bid_ids,))
+            cur.execute("DELETE FROM bid_evaluations WHERE id = ANY(%s)", (bid_ids,))
+        conn.commit()
+
+    scraper.db.run(delete)
+
+
+def histogram_totals(metrics, name: str):
+    """Merged [buckets, sum, count] of a histogram over all its label sets"""
+    merged = [[0] * len(LATENCY_BUCKETS), 0.0, 0]
+    for (metric, _), (buckets, total, count) in metrics.histograms.items():
+        if metric == name:
+            merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+            merged[1] += total
+            merged[2] += count
+    return merged
+
+
+def counter_total(metrics, name: str, **labels) -> float:
+    wanted = set(labels.items())
+    return sum(value for (metric, key), value in metrics.counters.items()
+               if metric == name and wanted <= set(key))
+
+
+def run_benchmark(args) -> dict:
+    os.environ.update({
+        "GEM_BASE_URL": f"http://127.0.0.1:{args.port}",
+        "GEM_COOKIE": os.getenv("GEM_COOKIE") or "bench",
+        "CSRF_TOKEN": os.getenv("CSRF_TOKEN") or "bench",
+        "RESULT_CACHE_PATH": "",
+        "CRAWL_CHECKPOINTS": "1" if args.checkpoints else "0",
+        "PARSER_BACKEND": args.backend,
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING")
+    })
+    if args.parse_workers is not None:
+        os.environ["PARSE_WORKERS"] = str(args.parse_workers)
+
+    scraper = GeMBidScraper()
+    unlimited = 1e6
+    scraper.rate_limiter = AdaptiveRateLimiter({family: unlimited for family in DEFAULT_RATE_LIMITS},
+                                               max_rate=unlimited)
+    delete_mock_bids(scraper, args.bids)
+
+    server = start_mock_server(args)
+    try:
+        output = io.StringIO()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(output if not args.verbose else sys.stdout):
+            stats = scraper.process_all_bids(1, math.ceil(args.bids / 10), args.concurrency)
+        elapsed = time.perf_counter() - started
+        served = mock_stats(args.port)
+    finally:
+        server.terminate()
+        server.wait()
+
+    if not stats:
+        print(output.getvalue())
+        raise RuntimeError("crawl did not run")
+
+    metrics = scraper.metrics
+    parse = histogram_totals(metrics, "gem_parse_seconds")
+    flush = histogram_totals(metrics, "gem_db_flush_seconds")
+    rows = counter_total(metrics, "gem_db_rows_total", result="saved")
+    return {
+        "settings": {"bids": args.bids, "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms,
+                     "error_rate": args.error_rate, "concurrency": args.concurrency or scraper.concurrency,
+                     "parse_workers": scraper.parse_worker_count, "backend": scraper.parser_backend},
+        "seconds": elapsed,
+        "processed": stats["processed"],
+        "saved": stats["saved"],
+        "failed": stats["failed"],
+        "failed_pages": len(stats["failed_pages"]),
+        "requests": sum(served["requests"].values()),
+        "server_errors": served["errors"],
+        "retries": counter_total(metrics, "gem_http_retries_total"),
+        "parsed_pages": parse[2],
+        "bids_per_sec": stats["processed"] / elapsed if elapsed else 0.0,
+        "parse_ms_per_page": parse[1] / parse[2] * 1000 if parse[2] else 0.0,
+        "parse_p95_ms": metrics.quantile(parse, 0.95) * 1000 if parse[2] else 0.0,
+        "db_rows_per_sec": rows / flush[1] if flush[1] else 0.0,
+        "db_rows_per_wall_sec": rows / elapsed if elapsed else 0.0
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    """Figures that got worse than the baseline by more than tolerance"""
+    regressions = []
+    for figure, higher_is_better in FIGURES.items():
+        before, after = baseline.get(figure), result.get(figure)
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        worse = -change if higher_is_better else change
+        marker = "✗" if worse > tolerance else " "
+        print(f"{marker} {figure:<20} {before:>10.2f} -> {after:>10.2f} ({change:+.1%})")
+        if worse > tolerance:
+            regressions.append(figure)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end crawl benchmark against a mock GeM server")
+    parser.add_argument("--bids", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, help="result views fetched at once (default SCRAPER_CONCURRENCY)")
+    parser.add_argument("--parse-workers", type=int, help="parse worker processes (default PARSE_WORKERS)")
+    parser.add_argument("--backend", choices=["lxml", "bs4"], default="lxml")
+    parser.add_argument("--checkpoints", action="store_true", help="record crawl checkpoints as a real run does")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with results saved by an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    parser.add_argument("--verbose", action="store_true", help="show the crawl's own output")
+    args = parser.parse_args()
+
+    result = run_benchmark(args)
+    settings = result["settings"]
+    print(f"Crawled {result['processed']} bids in {result['seconds']:.2f}s "
+          f"({settings['latency_ms']:g}±{settings['jitter_ms']:g}ms latency, {settings['error_rate']:.1%} errors, "
+          f"concurrency {settings['concurrency']}, {settings['parse_workers']} parse workers, {settings['backend']})")
+    print(f"  saved {result['saved']}, failed {result['failed']}, failed listing pages {result['failed_pages']}")
+    print(f"  {result['requests']} requests, {result['server_errors']} server errors, {result['retries']:g} retries")
+    print(f"  end to end:  {result['bids_per_sec']:10.1f} bids/sec")
+    print(f"  parse:       {result['parse_ms_per_page']:10.2f} ms/page (p95 {result['parse_p95_ms']:.2f} ms, "
+          f"{result['parsed_pages']} pages)")
+    print(f"  database:    {result['db_rows_per_sec']:10.1f} rows/sec while writing "
+          f"({result['db_rows_per_wall_sec']:.1f} rows/sec overall)")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(result, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
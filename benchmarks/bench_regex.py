@@ -0,0 +1,88 @@
+"""
+Micro-benchmark for seller name cleaning and parent bid ID detection.
+
+Compares the previous inline re.sub / re.search implementations with the
+precompiled, memoized versions in working.py.
+
+Usage:
+    python benchmarks/bench_regex.py [rows]
+"""
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from working import GeMBidScraper, clean_seller_name_cached
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "result_views")
+
+
+def legacy_clean_seller_name(raw_name: str) -> str:
+    """clean_seller_name before precompiling"""
+    if not raw_name:
+        return ""
+    clean_name = re.sub(r'<[^>]+>', '', raw_name)
+    clean_name = re.sub(r'\s*\([^)]*MSE[^)]*\)', '', clean_name, flags=re.IGNORECASE)
+    clean_name = re.sub(r'\s*\([^)]*Social Category[^)]*\)', '', clean_name, flags=re.IGNORECASE)
+    clean_name = re.sub(r'\s+', ' ', clean_name).strip()
+    return clean_name.split('\n')[0].strip()
+
+
+def legacy_extract_parent_bid_id(html_content: str):
+    """extract_parent_bid_id_from_html before the single alternation pass"""
+    parent_patterns = [
+        r'Parent\s*Bid\s*ID[:\s]*(\d+)',
+        r'parent[_\s]*bid[_\s]*id[:\s]*(\d+)',
+        r'getSinglePacketResultView/(\d+)',
+        r'b_id_parent[:\s]*(\d+)'
+    ]
+    for pattern in parent_patterns:
+        match = re.search(pattern, html_content, re.IGNORECASE)
+        if match:
+            return match.group(1)
+    return None
+
+
+def seller_rows(count: int):
+    """Raw seller cell texts; a few hundred sellers repeat across many bids"""
+    random.seed(7)
+    sellers = [f"SELLER {i} ENTERPRISES PRIVATE LIMITED" for i in range(300)]
+    suffixes = ["", "\n(MSE Social Category: General)", " (MSE)", "<br>(Social Category: OBC)"]
+    return [random.choice(sellers) + random.choice(suffixes) for _ in range(count)]
+
+
+def per_call_us(function, inputs) -> float:
+    seconds = timeit.timeit(lambda: [function(value) for value in inputs], number=5)
+    return seconds / 5 / len(inputs) * 1e6
+
+
+def main():
+    rows = seller_rows(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
+    scraper = GeMBidScraper(init_database=False)
+
+    assert [legacy_clean_seller_name(row) for row in rows] == [scraper.clean_seller_name(row) for row in rows]
+
+    print("clean_seller_name, per row:")
+    print(f"  before (inline re.sub x4):     {per_call_us(legacy_clean_seller_name, rows):.2f} us")
+    print(f"  precompiled, uncached:         {per_call_us(clean_seller_name_cached.__wrapped__, rows):.2f} us")
+    clean_seller_name_cached.cache_clear()
+    print(f"  precompiled + memoized:        {per_call_us(scraper.clean_seller_name, rows):.2f} us")
+
+    pages = []
+    for name in sorted(os.listdir(FIXTURES)):
+        if name.endswith(".html"):
+            with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+                pages.append(f.read())
+
+    assert [legacy_extract_parent_bid_id(page) for page in pages] == [scraper.extract_parent_bid_id_from_html(page) for page in pages]
+
+    print("\nextract_parent_bid_id_from_html, per page:")
+    print(f"  before (4 searches):           {per_call_us(legacy_extract_parent_bid_id, pages):.2f} us")
+    print(f"  single alternation pass:       {per_call_us(scraper.extract_parent_bid_id_from_html, pages):.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Local stand-in for the GeM bidplus endpoints used by the crawler, for offline benchmarks.
+
+Listing documents recorded in fixtures/listing are repeated with fresh bid ids until the
+listing holds --bids bids (children of reverse auctions keep a parent, one per listing page).
+Each bid gets one of the result view pages in fixtures/result_views, picked from its id so
+every run serves the same pages; parents get the single packet view. Every response waits
+--latency-ms (plus up to --jitter-ms) and fails with 503 at --error-rate.
+
+Usage:
+    python benchmarks/mock_gem_server.py [--port 8765] [--bids 2000] [--latency-ms 50]
+                                         [--jitter-ms 20] [--error-rate 0.0] [--seed 1]
+
+Crawl it with GEM_BASE_URL=http://127.0.0.1:8765 (any GEM_COOKIE and CSRF_TOKEN).
+GET /stats returns request and error counts.
+"""
+import argparse
+import asyncio
+import copy
+import glob
+import hashlib
+import json
+import os
+import random
+from datetime import date, timedelta
+
+from aiohttp import web
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LISTING_FIXTURES = os.path.join(ROOT, "fixtures", "listing")
+RESULT_VIEW_FIXTURES = os.path.join(ROOT, "fixtures", "result_views")
+
+# Mock bid ids start here so they never collide with real bids in the same database
+BID_ID_BASE = 90000000
+PARENT_ID_BASE = 80000000
+
+# Result view pages served for getBidResultView, with their share of bids
+RESULT_VIEW_MIX = {
+    "technical_financial": 4,
+    "general_evaluation": 2,
+    "technical_only_disqualified": 2,
+    "large_multi_seller": 1,
+    "nested_panels": 1,
+    "table_only": 1,
+    "no_evaluation": 1
+}
+PARENT_RESULT_VIEW = "single_packet_parent"
+
+# End dates of the mock bids are spread over this many days ending on LAST_END_DATE,
+# which keeps them inside the crawler's default byEndDate window
+END_DATE_DAYS = 59
+LAST_END_DATE = date(2025, 3, 1)
+
+
+def mock_bid_id(index: int) -> str:
+    """Id of the index-th mock bid (shared with the benchmarks that clean up after it)"""
+    return str(BID_ID_BASE + index)
+
+
+def load_listing_docs(fixtures_dir: str = LISTING_FIXTURES) -> list:
+    """Every bid document of the recorded /all-bids-data pages, in page order"""
+    docs = []
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            docs.extend(json.load(f)["response"]["response"]["docs"])
+    if not docs:
+        raise ValueError(f"no listing fixtures in {fixtures_dir}")
+    return docs
+
+
+def build_bids(count: int, page_size: int, templates: list) -> list:
+    """count listing documents cycled from the templates, as (end date, doc)"""
+    bids = []
+    for index in range(count):
+        doc = copy.deepcopy(templates[index % len(templates)])
+        end_date = LAST_END_DATE - timedelta(days=index * END_DATE_DAYS // max(count, 1))
+        doc["id"] = [mock_bid_id(index)]
+        doc["b_bid_number"] = [f"GEM/2025/{'R' if doc.get('b_id_parent') else 'B'}/{BID_ID_BASE + index}"]
+        doc["final_end_date_sort"] = [f"{end_date:%Y-%m-%d}T11:00:00Z"]
+        if doc.get("b_id_parent"):
+            parent_id = PARENT_ID_BASE + index // page_size
+            doc["b_id_parent"] = [str(parent_id)]
+            doc["b_bid_number_parent"] = [f"GEM/2025/B/{parent_id}"]
+        bids.append((end_date, doc))
+    return bids
+
+
+def load_result_views(fixtures_dir: str = RESULT_VIEW_FIXTURES) -> dict:
+    """Result view HTML by fixture name"""
+    pages = {}
+    for name in list(RESULT_VIEW_MIX) + [PARENT_RESULT_VIEW]:
+        with open(os.path.join(fixtures_dir, name + ".html"), encoding="utf-8") as f:
+            pages[name] = f.read()
+    return pages
+
+
+class MockGemServer:
+    """aiohttp application serving the listing and result view endpoints"""
+
+    def __init__(self, bids: int = 2000, page_size: int = 10, latency_ms: float = 50, jitter_ms: float = 20,
+                 error_rate: float = 0.0, seed: int = 1):
+        self.page_size = page_size
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.bids = build_bids(bids, page_size, load_listing_docs())
+        self.result_views = load_result_views()
+        self.result_view_mix = [name for name, share in RESULT_VIEW_MIX.items() for _ in range(share)]
+        self.etags = {name: '"%s"' % hashlib.md5(body.encode()).hexdigest()[:16]
+                      for name, body in self.result_views.items()}
+        self.stats = {"requests": {}, "errors": 0, "not_modified": 0, "bytes": 0}
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.add_routes([
+            web.post("/all-bids-data", self.listing),
+            web.get("/bidding/bid/getBidResultView/{bid_id}", self.result_view),
+            web.get("/bidding/bid/getSinglePacketResultView/{bid_id}", self.result_view),
+            web.get("/stats", self.get_stats)
+        ])
+        return app
+
+    async def respond_slowly(self, endpoint: str) -> bool:
+        """Wait the configured latency, returns False when this request should fail"""
+        self.stats["requests"][endpoint] = self.stats["requests"].get(endpoint, 0) + 1
+        await asyncio.sleep(max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter)))
+        if self.random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return False
+        return True
+
+    def filtered_bids(self, listing_filter: dict) -> list:
+        """Bids matching the byEndDate window of a listing filter, if it has one"""
+        window = listing_filter.get("byEndDate") or {}
+        if not window.get("from") and not window.get("to"):
+            return [doc for _, doc in self.bids]
+        date_from = date.fromisoformat(window["from"]) if window.get("from") else date.min
+        date_to = date.fromisoformat(window["to"]) if window.get("to") else date.max
+        return [doc for end_date, doc in self.bids if date_from <= end_date <= date_to]
+
+    async def listing(self, request: web.Request) -> web.Response:
+        if not await self.respond_slowly("all-bids-data"):
+            return web.Response(status=503)
+        form = await request.post()
+        payload = json.loads(form["payload"])
+        bids = self.filtered_bids(payload.get("filter") or {})
+        start = (int(payload.get("page", 1)) - 1) * self.page_size
+        body = json.dumps({"status": 1, "response": {"response": {
+            "numFound": len(bids), "start": start, "numFoundExact": True,
+            "docs": bids[start:start + self.page_size]
+        }}})
+        self.stats["bytes"] += len(body)
+        response = web.Response(text=body, content_type="application/json")
+        response.enable_compression()
+        return response
+
+    async def result_view(self, request: web.Request) -> web.Response:
+        endpoint = request.path.split("/")[3]
+        if not await self.respond_slowly(endpoint):
+            return web.Response(status=503)
+        if endpoint == "getSinglePacketResultView":
+            name = PARENT_RESULT_VIEW
+        else:
+            name = self.result_view_mix[int(request.match_info["bid_id"]) % len(self.result_view_mix)]
+        if request.headers.get("If-None-Match") == self.etags[name]:
+            self.stats["not_modified"] += 1
+            return web.Response(status=304)
+        body = self.result_views[name]
+        self.stats["bytes"] += len(body)
+        response = web.Response(text=body, content_type="text/html", headers={"ETag": self.etags[name]})
+        response.enable_compression()
+        return response
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock GeM bidplus server for offline benchmarks")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--bids", type=int, default=2000, help="bids in the listing")
+    parser.add_argument("--page-size", type=int, default=10, help="bids per listing page")
+    parser.add_argument("--latency-ms", type=float, default=50, help="mean response delay")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="uniform +- spread of the delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--seed", type=int, default=1, help="seed for latency and errors")
+    args = parser.parse_args()
+
+    server = MockGemServer(args.bids, args.page_size, args.latency_ms, args.jitter_ms, args.error_rate, args.seed)
+    banner = (f"Mock GeM server on http://127.0.0.1:{args.port} ({args.bids} bids, "
+              f"{args.latency_ms:g}±{args.jitter_ms:g}ms, {args.error_rate:.1%} errors)")
+    # Printed once the socket is bound, bench_pipeline.py waits for this line
+    web.run_app(server.app(), host="127.0.0.1", port=args.port, print=lambda _: print(banner, flush=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Record live GeM responses as benchmark fixtures.
+
+Saves /all-bids-data pages to fixtures/listing (served by mock_gem_server.py) and, with
+--views DIR, the result view HTML of the listed bids for bench_parse.py and
+check_parser_parity.py. Uses GEM_COOKIE and CSRF_TOKEN like a crawl.
+
+Usage:
+    python benchmarks/record_fixtures.py [--pages 2] [--views DIR] [--max-views 20]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_gem_server import LISTING_FIXTURES
+from working import GeMBidScraper
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record live GeM responses as benchmark fixtures")
+    parser.add_argument("--pages", type=int, default=2, help="listing pages to record")
+    parser.add_argument("--views", help="also save result views of the listed bids in this directory")
+    parser.add_argument("--max-views", type=int, default=20)
+    args = parser.parse_args()
+
+    scraper = GeMBidScraper(init_database=False)
+    if not scraper.cookie_value or not scraper.csrf_token:
+        print("Set GEM_COOKIE and CSRF_TOKEN to record fixtures")
+        sys.exit(1)
+
+    bid_infos = []
+    for page in range(1, args.pages + 1):
+        response = scraper.send_request("POST", f"{scraper.base_url}/all-bids-data", idempotent=True,
+                                        headers=scraper.listing_headers, data=scraper.build_listing_payload(page))
+        response.raise_for_status()
+        data = response.json()
+        path = os.path.join(LISTING_FIXTURES, f"all_bids_page_{page}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        docs = data.get("response", {}).get("response", {}).get("docs") or []
+        bid_infos.extend(scraper.extract_bid_info(doc) for doc in docs)
+        print(f"{path}: {len(docs)} bids")
+
+    if args.views:
+        os.makedirs(args.views, exist_ok=True)
+        for bid_info in bid_infos[:args.max_views]:
+            response = scraper.send_request("GET", scraper.get_result_view_url(bid_info["id"]),
+                                            headers=scraper.get_result_view_headers(bid_info["id"]))
+            if response.status_code != 200:
+                print(f"  {bid_info['id']}: HTTP {response.status_code}")
+                continue
+            path = os.path.join(args.views, f"bid_{bid_info['id']}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(response.text)
+            print(f"  {path}: {len(response.text) / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Parser parity check for result view backends.
+
+Parses every result view HTML in the corpus with the BeautifulSoup and lxml backends
+and compares the evaluation output with each other and with the recorded <name>.json
+expectation next to each page.
+
+The default corpus, fixtures/result_views, is synthetic: hand-written pages covering
+each layout the parser handles (panels, table-only fallback, parent view, 60 sellers),
+not captured GeM responses. Passing it only shows the backends agree on those pages.
+Check real pages by capturing them first:
+
+    python benchmarks/record_fixtures.py --views captured/
+    python check_parser_parity.py captured/ --update
+
+Usage:
+    python check_parser_parity.py [corpus_dir] [--update]
+
+--update rewrites the .json expectations from the BeautifulSoup (reference) backend.
+"""
+import json
+import os
+import sys
+
+from working import GeMBidScraper
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "result_views")
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    update = "--update" in sys.argv
+    corpus_dir = args[0] if args else DEFAULT_CORPUS
+
+    scraper = GeMBidScraper(init_database=False)
+    pages = sorted(name for name in os.listdir(corpus_dir) if name.endswith(".html"))
+    mismatches = 0
+
+    for name in pages:
+        with open(os.path.join(corpus_dir, name), encoding="utf-8") as f:
+            html_content = f.read()
+
+        reference = scraper.parse_result_view_html(html_content, name, parser_backend="bs4")
+        fast = scraper.parse_result_view_html(html_content, name, parser_backend="lxml")
+        expected_path = os.path.join(corpus_dir, name[:-len(".html")] + ".json")
+
+        if update:
+            with open(expected_path, "w", encoding="utf-8") as f:
+                json.dump(reference, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+
+        problems = []
+        if fast != reference:
+            problems.append("lxml output differs from bs4")
+        if os.path.exists(expected_path):
+            with open(expected_path, encoding="utf-8") as f:
+                expected = json.load(f)
+            if reference != expected:
+                problems.append("bs4 output differs from recorded expectation")
+            if fast != expected:
+                problems.append("lxml output differs from recorded expectation")
+        else:
+            problems.append("no recorded expectation (run with --update)")
+
+        sellers = len(reference.get("sellers_participated", []))
+        if problems:
+            mismatches += 1
+            print(f"✗ {name} ({sellers} sellers): {'; '.join(problems)}")
+            print(f"    bs4:  {json.dumps(reference, ensure_ascii=False)}")
+            print(f"    lxml: {json.dumps(fast, ensure_ascii=False)}")
+        else:
+            print(f"✓ {name} ({sellers} sellers)")
+
+    print(f"\n{len(pages) - mismatches}/{len(pages)} pages match")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,1727 @@
-import requests
+from __future__ import annotations
+
 import json
-from datetime import datetime
+import copy
+from datetime import datetime, timedelta
 import time
-from typing import Dict, List, Any, Optional, Union
+import math
+from decimal import Decimal
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple, Union
 import re
-import psycopg2
-from psycopg2.extras import RealDictCursor
-import psycopg2.extras
+import random
+import functools
+from itertools import islice
 import os
-from dotenv import load_dotenv
+import sys
+import logging
+import argparse
+import hashlib
+import importlib
+import importlib.util
+import uuid
+import threading
+import sqlite3
+import zlib
+import io
+import asyncio
+from contextlib import contextmanager
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+class LazyModule:
+    """
+    Stand-in for a heavy dependency that imports it (and the listed submodules) on first
+    attribute access, so commands that never touch it start without paying for the import
+    """
+    
+    def __init__(self, name: str, *submodules: str):
+        self.lazy_name = name
+        self.lazy_submodules = submodules
+        self.lazy_module = None
+    
+    def __getattr__(self, attribute: str):
+        if self.lazy_module is None:
+            for submodule in self.lazy_submodules:
+                importlib.import_module(submodule)
+            self.lazy_module = importlib.import_module(self.lazy_name)
+        return getattr(self.lazy_module, attribute)
+
+# Network and database clients and the lxml parser are imported on first use:
+# stats and other quick commands skip them
+requests = LazyModule("requests")
+aiohttp = LazyModule("aiohttp")
+psycopg2 = LazyModule("psycopg2", "psycopg2.extras", "psycopg2.pool")
+lxml_etree = LazyModule("lxml.etree")
+
+# requests and aiohttp decode br responses only when brotli is installed
+ACCEPT_ENCODING = "gzip, deflate, br" if importlib.util.find_spec("brotli") else "gzip, deflate"
+
+@functools.lru_cache(maxsize=None)
+def load_environment():
+    """Read .env into the environment (once), before the first setting is taken from it"""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+logger = logging.getLogger("gem_scraper")
+
+class StructuredLogFormatter(logging.Formatter):
+    """One JSON object per line (or key=value text): time, level, event and the event's fields"""
+    
+    def __init__(self, json_lines: bool = True):
+        super().__init__()
+        self.json_lines = json_lines
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "event": record.getMessage()
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        if self.json_lines:
+            return json.dumps(entry, ensure_ascii=False, default=str)
+        fields = " ".join(f"{key}={value}" for key, value in entry.items()
+                          if key not in ("ts", "level", "event") and value is not None)
+        return f"{entry['ts']} {entry['level'].upper():7} {entry['event']} {fields}".rstrip()
+
+class SampleFilter(logging.Filter):
+    """Let through only a fraction of the records logged with sample=True (per-bid detail)"""
+    
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not getattr(record, "sample", False) or random.random() < self.rate
+
+def configure_logging(level: Optional[str] = None, log_format: Optional[str] = None,
+                      sample_rate: Optional[float] = None, path: Optional[str] = None):
+    """
+    Set up the scraper's log handler from arguments or LOG_LEVEL (INFO), LOG_FORMAT (json or text),
+    LOG_SAMPLE_RATE (share of per-bid detail records kept, 0.01) and LOG_FILE (default stderr).
+    Replaces a handler installed earlier
+    """
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    log_format = log_format or os.getenv("LOG_FORMAT", "json")
+    sample_rate = float(os.getenv("LOG_SAMPLE_RATE", "0.01")) if sample_rate is None else sample_rate
+    path = path or os.getenv("LOG_FILE")
+    
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    handler = logging.FileHandler(path, encoding="utf-8") if path else logging.StreamHandler(sys.stderr)
+    handler.setFormatter(StructuredLogFormatter(json_lines=log_format != "text"))
+    handler.addFilter(SampleFilter(sample_rate))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+def log_event(level: int, event: str, sample: bool = False, **fields):
+    """Log a structured event; fields become keys of the JSON line. sample=True marks per-bid detail"""
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={"fields": fields, "sample": sample})
+
+# Precompiled patterns for seller name cleaning and the regex fallbacks.
+# Tags must go first: removing them can join whitespace onto a following parenthetical
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+SELLER_CATEGORY_RE = re.compile(r'\s*\([^)]*(?:MSE|Social Category)[^)]*\)', re.IGNORECASE)
+
+# Parent bid ID patterns in priority order, as one alternation (group N holds the ID for pattern N).
+# The lookahead skips positions that cannot start any of them
+PARENT_BID_ID_RE = re.compile(
+    r'(?=[pgb])(?:'
+    r'Parent\s*Bid\s*ID[:\s]*(\d+)'
+    r'|parent[_\s]*bid[_\s]*id[:\s]*(\d+)'
+    r'|getSinglePacketResultView/(\d+)'
+    r'|b_id_parent[:\s]*(\d+))',
+    re.IGNORECASE
+)
+
+TECHNICAL_EVALUATION_RE = re.compile(r'technical\s+evaluat', re.IGNORECASE)
+FINANCIAL_EVALUATION_RE = re.compile(r'financial\s+evaluat', re.IGNORECASE)
+GENERAL_EVALUATION_RE = re.compile(r'evaluation|sellers?\s+participated', re.IGNORECASE)
+SELLER_NAME_RES = [
+    re.compile(r'<td[^>]*>\s*<span[^>]*>\s*([A-Z][A-Z\s&/.,-]+?)\s*<br', re.IGNORECASE),  # Seller names before <br>
+    re.compile(r'<td[^>]*>\s*([A-Z][A-Z\s&/.,-]{10,}?)\s*</td>', re.IGNORECASE),  # Direct seller names in TD
+]
+
+@functools.lru_cache(maxsize=65536)
+def clean_seller_name_cached(raw_name: str) -> str:
+    """Memoized seller name cleaning, the same sellers repeat across thousands of bids"""
+    clean_name = HTML_TAG_RE.sub('', raw_name)
+    # Remove MSE / Social Category info in parentheses
+    clean_name = SELLER_CATEGORY_RE.sub('', clean_name)
+    # Collapse whitespace and line breaks
+    return ' '.join(clean_name.split())
+
+PRICE_RE = re.compile(r'\d[\d,]*(?:\.\d+)?')
+RANK_RE = re.compile(r'^\s*L?\s*-?\s*(\d+)\s*$', re.IGNORECASE)
+
+def parse_price(text: Optional[str]) -> Optional[Decimal]:
+    """Numeric value of a price cell such as '₹ 1,23,456.00' (any digit grouping), None if there is none"""
+    if not text:
+        return None
+    match = PRICE_RE.search(text)
+    if match is None:
+        return None
+    return Decimal(match.group().replace(',', ''))
+
+def parse_rank(text: Optional[str]) -> Optional[int]:
+    """Integer rank from 'L1', 'L 2' or '3', None for anything else"""
+    if not text:
+        return None
+    match = RANK_RE.match(text)
+    return int(match.group(1)) if match else None
+
+# Normalized seller status values (status_value), the raw text stays in status
+SELLER_STATUSES = ("qualified", "disqualified", "other")
+# Negative forms are matched first, and "qualified" only as a whole word ("Unqualified" is not qualified)
+SELLER_DISQUALIFIED_RE = re.compile(
+    r'disqualif|unqualif|non[\s-]*qualif|not\s+qualif|ineligible|not\s+eligible|rejected', re.IGNORECASE
+)
+SELLER_QUALIFIED_RE = re.compile(r'\bqualified\b', re.IGNORECASE)
+
+def parse_seller_status(text: Optional[str]) -> Optional[str]:
+    """One of SELLER_STATUSES for a status cell, None when it is empty"""
+    if not text:
+        return None
+    if SELLER_DISQUALIFIED_RE.search(text):
+        return "disqualified"
+    if SELLER_QUALIFIED_RE.search(text):
+        return "qualified"
+    return "other"
+
+def add_typed_seller_fields(seller: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add total_price_value, rank_value and status_value next to the raw text fields a seller has.
+    Prices are kept exact as decimal strings: JSON numbers would go through float
+    """
+    if "total_price" in seller:
+        price = parse_price(seller["total_price"])
+        seller["total_price_value"] = str(price) if price is not None else None
+    if "rank" in seller:
+        seller["rank_value"] = parse_rank(seller["rank"])
+    if "status" in seller:
+        seller["status_value"] = parse_seller_status(seller["status"])
+    return seller
+
+# Bounds of the bid_participations columns. Values outside them are stored as NULL or truncated,
+# the rows share the bid upsert's transaction and one bad seller field must not fail the bid
+PARTICIPATION_MAX_RANK = 2 ** 31 - 1  # INTEGER
+PARTICIPATION_MAX_PRICE = Decimal("1e18")  # NUMERIC(20, 2)
+
+# /all-bids-data filter used by a crawl: awarded bids ending in the window
+DEFAULT_LISTING_FILTER = {
+    "bidStatusType": "bidrastatus",
+    "byType": "all",
+    "highBidValue": "",
+    "byEndDate": {
+        "from": "2025-01-01",
+        "to": "2025-03-01"
+    },
+    "sort": "Bid-End-Date-Latest",
+    "byStatus": "bid_awarded"
+}
+
+def get_end_date_window(listing_filter: Dict[str, Any]) -> Optional[Tuple[datetime, datetime]]:
+    """The byEndDate range of a listing filter as dates, None if it has no complete range"""
+    window = listing_filter.get("byEndDate") or {}
+    try:
+        return (datetime.strptime(window["from"], "%Y-%m-%d"), datetime.strptime(window["to"], "%Y-%m-%d"))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def with_end_date_window(listing_filter: Dict[str, Any], date_from: datetime, date_to: datetime) -> Dict[str, Any]:
+    """Copy of a listing filter restricted to bids ending between two dates (both inclusive)"""
+    listing_filter = copy.deepcopy(listing_filter)
+    listing_filter["byEndDate"] = {"from": f"{date_from:%Y-%m-%d}", "to": f"{date_to:%Y-%m-%d}"}
+    return listing_filter
+
+# Keys of a listing filter sent in the payload's "param" section instead of "filter", with defaults
+LISTING_PARAM_KEYS = {"searchBid": "", "searchType": "fullText"}
+
+# Top-level crawl plan settings passed on to process_all_bids
+CRAWL_PLAN_SETTINGS = ("start_page", "end_page", "concurrency", "incremental", "refresh_days", "split_windows")
+
+def load_crawl_plan(path: str, base_filter: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Read a crawl plan (YAML or JSON) listing the filter combinations to crawl together:
+
+        defaults:
+          byEndDate: {from: "2024-01-01", to: "2024-12-31"}
+        split_windows: true
+        slices:
+          - name: awarded
+          - name: cancelled
+            filter: {byStatus: bid_cancelled}
+          - name: chairs
+            search: chairs
+
+    Each slice's filter is base_filter updated with defaults and then its own filter, search
+    sets searchBid. Returns the CRAWL_PLAN_SETTINGS found and "slices" as (name, filter) pairs.
+    Raises ValueError for an unreadable or malformed plan
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("YAML crawl plans need PyYAML (pip install pyyaml), or use JSON")
+            try:
+                plan = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid YAML in {path}: {e}")
+        else:
+            try:
+                plan = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON in {path}: {e}")
+    
+    if not isinstance(plan, dict) or not isinstance(plan.get("slices"), list) or not plan["slices"]:
+        raise ValueError(f"{path}: a crawl plan needs a non-empty 'slices' list")
+    defaults = plan.get("defaults") or {}
+    if not isinstance(defaults, dict):
+        raise ValueError(f"{path}: 'defaults' must be a mapping of filter fields")
+    
+    slices = []
+    for number, entry in enumerate(plan["slices"], 1):
+        if not isinstance(entry, dict) or not isinstance(entry.get("filter") or {}, dict):
+            raise ValueError(f"{path}: slice {number} must be a mapping with an optional 'filter' mapping")
+        listing_filter = copy.deepcopy(base_filter)
+        listing_filter.update(copy.deepcopy(defaults))
+        listing_filter.update(copy.deepcopy(entry.get("filter") or {}))
+        if "search" in entry:
+            listing_filter["searchBid"] = str(entry["search"])
+        if "search_type" in entry:
+            listing_filter["searchType"] = str(entry["search_type"])
+        # YAML reads unquoted dates as date objects, the API wants strings
+        listing_filter = json.loads(json.dumps(listing_filter, default=str))
+        slices.append((str(entry.get("name") or f"slice{number}"), listing_filter))
+    
+    names = [name for name, _ in slices]
+    if len(set(names)) != len(names):
+        raise ValueError(f"{path}: slice names must be unique")
+    # Progress is kept per filter, two slices with one filter would share it
+    keys = [listing_filter_key(listing_filter) for _, listing_filter in slices]
+    if len(set(keys)) != len(keys):
+        raise ValueError(f"{path}: two slices have the same filter")
+    
+    settings = {key: plan[key] for key in CRAWL_PLAN_SETTINGS if key in plan}
+    settings["slices"] = slices
+    return settings
+
+# Responses worth retrying for idempotent requests (GETs and the /all-bids-data search)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Initial requests per second for each endpoint family
+DEFAULT_RATE_LIMITS = {
+    "all-bids-data": 2.0,
+    "getBidResultView": 5.0,
+    "getSinglePacketResultView": 5.0
+}
+
+class TokenBucket:
+    """Token bucket whose refill rate can be changed while in use"""
+    
+    def __init__(self, rate: float, burst: float, min_rate: float, max_rate: float):
+        self.rate = rate
+        self.capacity = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = burst
+        # Time the bucket was last refilled; lies in the future while paused
+        self.updated = time.monotonic()
+        # Time of the last rate cut, failures of requests sent before it are already accounted for
+        self.last_cut = float("-inf")
+    
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before sending"""
+        now = time.monotonic()
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+        
+        self.tokens -= 1
+        wait = max(0.0, self.updated - now)
+        if self.tokens < 0:
+            wait += -self.tokens / self.rate
+        return wait
+    
+    def pause(self, seconds: float):
+        """Stop handing out tokens for the given number of seconds"""
+        resume_at = time.monotonic() + seconds
+        if resume_at > self.updated:
+            self.updated = resume_at
+            self.tokens = min(self.tokens, 0.0)
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket budget per endpoint family, shared by every outgoing request.
+    The rate grows while responses are fast and healthy (by increase_share of the
+    current rate, at least increase) and is cut in half on 429/5xx, connection
+    errors or slow responses. Requests sent before the last cut do not cut again,
+    so a burst of failures in flight costs one halving, not one each.
+    """
+    
+    def __init__(self, rates: Optional[Dict[str, float]] = None, min_rate: float = 0.2,
+                 max_rate: float = 20.0, increase: float = 0.05, increase_share: float = 0.05,
+                 backoff_factor: float = 0.5, slow_response: float = 5.0):
+        self.increase = increase
+        self.increase_share = increase_share
+        self.backoff_factor = backoff_factor
+        self.slow_response = slow_response
+        self.lock = threading.Lock()
+        self.buckets = {
+            family: TokenBucket(rate, max(1.0, rate), min_rate, max_rate)
+            for family, rate in (rates or DEFAULT_RATE_LIMITS).items()
+        }
+    
+    def family_for_url(self, url: str) -> str:
+        """Map a request URL to its endpoint family"""
+        for family in self.buckets:
+            if family in url:
+                return family
+        return "all-bids-data"
+    
+    def reserve(self, family: str) -> float:
+        with self.lock:
+            return self.buckets[family].reserve()
+    
+    def acquire(self, family: str):
+        """Block until the family budget allows another request"""
+        wait = self.reserve(family)
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def acquire_async(self, family: str):
+        """Async variant of acquire"""
+        wait = self.reserve(family)
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def record(self, family: str, status: Optional[int], elapsed: float, retry_after: Optional[str] = None,
+               sent_at: Optional[float] = None):
+        """
+        Adjust the family rate from a finished request (status None means no response).
+        sent_at is the time.monotonic() the request was sent, defaults to now - elapsed
+        """
+        with self.lock:
+            bucket = self.buckets[family]
+            now = time.monotonic()
+            if sent_at is None:
+                sent_at = now - elapsed
+            
+            if status is None or status == 429 or status >= 500 or elapsed > self.slow_response:
+                if sent_at >= bucket.last_cut:
+                    bucket.rate = max(bucket.min_rate, bucket.rate * self.backoff_factor)
+                    bucket.last_cut = now
+            else:
+                step = max(self.increase, bucket.rate * self.increase_share)
+                bucket.rate = min(bucket.max_rate, bucket.rate + step)
+            
+            delay = self.parse_retry_after(retry_after)
+            if delay:
+                bucket.pause(delay)
+    
+    def parse_retry_after(self, value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given in seconds or as an HTTP date"""
+        if not value:
+            return None
+        
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        
+        from email.utils import parsedate_to_datetime
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+    
+    def describe(self) -> str:
+        """Current rate of each family, for progress output"""
+        with self.lock:
+            return ", ".join(f"{family}: {bucket.rate:.2f}/s" for family, bucket in self.buckets.items())
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+                   30.0, 60.0, 120.0, 300.0)
+
+class CrawlMetrics:
+    """
+    Counters, gauges and latency histograms for each crawl stage, in Prometheus naming.
+    Safe to update from threads. Parse worker processes collect into their own instance
+    and hand export() back with each result for merge()
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        # (name, sorted label pairs) -> value, or [bucket counts, sum, count] for histograms
+        self.counters: Dict[Tuple[str, tuple], float] = {}
+        self.gauges: Dict[Tuple[str, tuple], float] = {}
+        self.histograms: Dict[Tuple[str, tuple], list] = {}
+    
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+    
+    def set_gauge(self, name: str, value: float, **labels):
+        with self.lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = value
+    
+    def max_gauge(self, name: str, value: float, **labels):
+        """Keep the highest value seen"""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.gauges[key] = max(self.gauges.get(key, value), value)
+    
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [[0] * len(LATENCY_BUCKETS), 0.0, 0]
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    histogram[0][index] += 1
+                    break
+            histogram[1] += seconds
+            histogram[2] += 1
+    
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the duration of the block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+    
+    def export(self) -> Dict[str, list]:
+        """Plain picklable copy of counters and histograms, then reset"""
+        with self.lock:
+            exported = {
+                "counters": list(self.counters.items()),
+                "histograms": [(key, [list(buckets), total, count])
+                               for key, (buckets, total, count) in self.histograms.items()]
+            }
+            self.counters.clear()
+            self.histograms.clear()
+        return exported
+    
+    def merge(self, exported: Dict[str, list]):
+        """Add counters and histograms exported by another instance (e.g. a parse worker)"""
+        with self.lock:
+            for key, value in exported["counters"]:
+                self.counters[key] = self.counters.get(key, 0) + value
+            for key, (buckets, total, count) in exported["histograms"]:
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = [[0] * len(LATENCY_BUCKETS), 0.0, 0]
+                histogram[0] = [a + b for a, b in zip(histogram[0], buckets)]
+                histogram[1] += total
+                histogram[2] += count
+    
+    def quantile(self, histogram: list, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket, like histogram_quantile()"""
+        buckets, _, count = histogram
+        rank = q * count
+        cumulative, lower = 0, 0.0
+        for bound, bucket_count in zip(LATENCY_BUCKETS, buckets):
+            if bucket_count and cumulative + bucket_count >= rank:
+                return lower + (bound - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = bound
+        return LATENCY_BUCKETS[-1]
+    
+    def format_labels(self, labels: tuple, extra: str = "") -> str:
+        parts = [f'{key}="{value}"' for key, value in labels] + ([extra] if extra else [])
+        return "{" + ",".join(parts) + "}" if parts else ""
+    
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        with self.lock:
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+            histograms = sorted((key, (list(buckets), total, count))
+                                for key, (buckets, total, count) in self.histograms.items())
+        
+        lines = []
+        typed = set()
+        
+        def declare(name: str, kind: str):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+        
+        declare("gem_uptime_seconds", "gauge")
+        lines.append(f"gem_uptime_seconds {time.time() - self.started:.3f}")
+        for (name, labels), value in counters:
+            declare(name, "counter")
+            lines.append(f"{name}{self.format_labels(labels)} {value:g}")
+        for (name, labels), value in gauges:
+            declare(name, "gauge")
+            lines.append(f"{name}{self.format_labels(labels)} {value:g}")
+        for (name, labels), (buckets, total, count) in histograms:
+            declare(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS, buckets):
+                cumulative += bucket_count
+                le = 'le="%g"' % bound
+                lines.append(f"{name}_bucket{self.format_labels(labels, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{name}_bucket{self.format_labels(labels, le)} {count}")
+            lines.append(f"{name}_sum{self.format_labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{self.format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+    
+    def summary(self) -> str:
+        """End-of-run report: latency per stage, then counters and gauges"""
+        with self.lock:
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+            histograms = sorted((key, (list(buckets), total, count))
+                                for key, (buckets, total, count) in self.histograms.items())
+        
+        lines = [f"Run metrics ({time.time() - self.started:.1f}s):"]
+        for (name, labels), histogram in histograms:
+            _, total, count = histogram
+            if count:
+                lines.append(f"  {name}{self.format_labels(labels)}: {count} in {total:.2f}s, "
+                             f"mean {total / count * 1000:.1f}ms, p50 {self.quantile(histogram, 0.5) * 1000:.1f}ms, "
+                             f"p95 {self.quantile(histogram, 0.95) * 1000:.1f}ms")
+        for (name, labels), value in counters + gauges:
+            lines.append(f"  {name}{self.format_labels(labels)}: {value:g}")
+        return "\n".join(lines)
+    
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """Serve /metrics from a background thread (needs Flask)"""
+        from flask import Flask, Response
+        from werkzeug.serving import WSGIRequestHandler, make_server
+        
+        class QuietRequestHandler(WSGIRequestHandler):
+            # One log line per scrape would drown the crawl output
+            def log_request(self, *args, **kwargs):
+                pass
+        
+        app = Flask("gem_scraper_metrics")
+        app.add_url_rule("/metrics", "metrics",
+                         lambda: Response(self.render(), mimetype="text/plain; version=0.0.4"))
+        server = make_server(host, port, app, threaded=True, request_handler=QuietRequestHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        log_event(logging.INFO, "metrics_endpoint", url=f"http://{host}:{port}/metrics")
+        return server
+
+class DatabasePool:
+    """
+    Thread-safe psycopg2 connection pool owned by the scraper.
+    Connections idle for longer than health_check_interval are pinged before use,
+    and dropped connections are discarded and replaced with fresh ones.
+    """
+    
+    def __init__(self, db_config: Dict[str, Any], minconn: int = 1, maxconn: int = 5,
+                 health_check_interval: float = 30.0):
+        self.db_config = db_config
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.health_check_interval = health_check_interval
+        self.pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+        self.lock = threading.Lock()
+        # ThreadedConnectionPool raises when exhausted, callers wait on this instead
+        self.slots = threading.BoundedSemaphore(maxconn)
+        self.last_used: Dict[int, float] = {}
+        self.metrics = {
+            "checkouts": 0,
+            "connections_created": 0,
+            "connections_discarded": 0,
+            "health_check_failures": 0,
+            "retries": 0,
+            "wait_seconds": 0.0
+        }
+    
+    def get_pool(self) -> psycopg2.pool.ThreadedConnectionPool:
+        """Create the pool on first use"""
+        with self.lock:
+            if self.pool is None:
+                self.pool = psycopg2.pool.ThreadedConnectionPool(self.minconn, self.maxconn, **self.db_config)
+            return self.pool
+    
+    def is_healthy(self, conn) -> bool:
+        """Ping a connection that has been idle for a while"""
+        if conn.closed:
+            return False
+        
+        with self.lock:
+            last_used = self.last_used.get(id(conn))
+        if last_used is not None and time.monotonic() - last_used < self.health_check_interval:
+            return True
+        
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            with self.lock:
+                self.metrics["health_check_failures"] += 1
+            return False
+    
+    def checkout(self):
+        """Get a healthy connection, waiting for a free slot if the pool is exhausted"""
+        pool = self.get_pool()
+        started = time.monotonic()
+        self.slots.acquire()
+        
+        try:
+            while True:
+                conn = pool.getconn()
+                with self.lock:
+                    self.metrics["checkouts"] += 1
+                    self.metrics["wait_seconds"] += time.monotonic() - started
+                    if id(conn) not in self.last_used:
+                        self.metrics["connections_created"] += 1
+                
+                if self.is_healthy(conn):
+                    return conn
+                
+                # Dropped connection: close it so the pool opens a new one
+                self.discard(conn)
+        except Exception:
+            self.slots.release()
+            raise
+    
+    def discard(self, conn):
+        with self.lock:
+            self.metrics["connections_discarded"] += 1
+            self.last_used.pop(id(conn), None)
+        self.get_pool().putconn(conn, close=True)
+    
+    def release(self, conn, broken: bool = False):
+        """Return a connection to the pool (closing it if broken)"""
+        try:
+            if broken or conn.closed:
+                self.discard(conn)
+            else:
+                with self.lock:
+                    self.last_used[id(conn)] = time.monotonic()
+                self.get_pool().putconn(conn)
+        finally:
+            self.slots.release()
+    
+    @contextmanager
+    def connection(self):
+        """Check out a connection, commit on success and roll back on error"""
+        conn = self.checkout()
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except Exception as e:
+            # Only connection errors (SQLSTATE class 08) lose the connection: after a deadlock
+            # or statement timeout it is still usable once rolled back
+            broken = (conn.closed or isinstance(e, psycopg2.InterfaceError)
+                      or (isinstance(e, psycopg2.OperationalError) and (e.pgcode or "").startswith("08")))
+            if not broken:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+            raise
+        finally:
+            self.release(conn, broken)
+    
+    def run(self, operation, retries: int = 1):
+        """
+        Run operation(conn) in a pooled connection, retrying on a fresh connection
+        if the server dropped the one we had. Operations must be safe to repeat
+        """
+        for attempt in range(retries + 1):
+            try:
+                with self.connection() as conn:
+                    return operation(conn)
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                if attempt == retries:
+                    raise
+                with self.lock:
+                    self.metrics["retries"] += 1
+    
+    def health_check(self) -> bool:
+        """Check that the database is reachable"""
+        def ping(conn):
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+                return cur.fetchone()[0] == 1
+        return self.run(ping)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Pool metrics: checkout counters plus current in-use and idle connections"""
+        with self.lock:
+            stats = dict(self.metrics)
+            stats["in_use"] = len(self.pool._used) if self.pool else 0
+            stats["idle"] = len(self.pool._pool) if self.pool else 0
+            stats["max_connections"] = self.maxconn
+        return stats
+    
+    def close(self):
+        with self.lock:
+            if self.pool is not None:
+                self.pool.closeall()
+                self.pool = None
+            self.last_used.clear()
+
+BID_UPSERT_SQL = """
+    INSERT INTO bid_evaluations 
+    (id, bid_number, items, quantity, ministry_name, department_name, start_date, end_date, evaluation, parent_evaluation)
+    VALUES %s
+    ON CONFLICT ({conflict_target}) 
+    DO UPDATE SET
+        bid_number = EXCLUDED.bid_number,
+        items = EXCLUDED.items,
+        quantity = EXCLUDED.quantity,
+        ministry_name = EXCLUDED.ministry_name,
+        department_name = EXCLUDED.department_name,
+        start_date = EXCLUDED.start_date,
+        end_date = EXCLUDED.end_date,
+        evaluation = EXCLUDED.evaluation,
+        parent_evaluation = EXCLUDED.parent_evaluation,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+class BidBatchWriter:
+    """
+    Buffers bid rows and upserts them with one execute_values statement per batch.
+    A batch is due once it holds batch_size rows or its oldest row is flush_interval seconds old.
+    """
+    
+    def __init__(self, scraper: "GeMBidScraper", batch_size: int = 200, flush_interval: float = 2.0):
+        self.scraper = scraper
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Keyed by bid id: one statement cannot upsert the same row twice
+        self.rows: Dict[Any, tuple] = {}
+        self.oldest: Optional[float] = None
+    
+    def add(self, bid_info: Dict[str, Any]):
+        """Buffer a bid for the next flush"""
+        row = self.scraper.build_bid_row(bid_info)
+        if self.oldest is None:
+            self.oldest = time.monotonic()
+        self.rows[row[0]] = row
+    
+    def should_flush(self) -> bool:
+        """Check whether the batch is full or old enough to flush"""
+        if not self.rows:
+            return False
+        return len(self.rows) >= self.batch_size or time.monotonic() - self.oldest >= self.flush_interval
+    
+    def flush(self) -> Tuple[List[Any], List[Tuple[Any, str, str]]]:
+        """
+        Write buffered rows in one transaction, returns (saved ids, [(id, bid number, error)]).
+        If the batch statement fails, rows are retried one by one so a bad row only fails itself
+        """
+        rows = list(self.rows.values())
+        self.rows = {}
+        self.oldest = None
+        if not rows:
+            return [], []
+        
+        metrics = self.scraper.metrics
+        try:
+            with metrics.timer("gem_db_flush_seconds"):
+                self.scraper.ensure_partitions(row[7] for row in rows)
+                saved, failures = self.scraper.db.run(lambda conn: self.write_rows(conn, rows))
+        except Exception as e:
+            saved, failures = [], [(row[0], row[1], str(e).strip()) for row in rows]
+        metrics.inc("gem_db_rows_total", len(saved), result="saved")
+        metrics.inc("gem_db_rows_total", len(failures), result="failed")
+        return saved, failures
+    
+    def write_rows(self, conn, rows: List[tuple]) -> Tuple[List[Any], List[Tuple[Any, str, str]]]:
+        try:
+            with conn.cursor() as cur:
+                self.scraper.upsert_bid_rows(cur, rows)
+            conn.commit()
+            return [row[0] for row in rows], []
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            raise
+        except psycopg2.Error:
+            conn.rollback()
+        
+        saved, failures = [], []
+        with conn.cursor() as cur:
+            for row in rows:
+                cur.execute("SAVEPOINT bid_row")
+                try:
+                    self.scraper.upsert_bid_rows(cur, [row])
+                    cur.execute("RELEASE SAVEPOINT bid_row")
+                    saved.append(row[0])
+                except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                    raise
+                except psycopg2.Error as e:
+                    cur.execute("ROLLBACK TO SAVEPOINT bid_row")
+                    failures.append((row[0], row[1], str(e).strip()))
+        conn.commit()
+        return saved, failures
+
+# Per-bid crawl stages, in pipeline order
+CRAWL_STAGES = ("listed", "fetched", "parsed", "saved")
+
+CRAWL_BID_STATE_SQL = """
+    INSERT INTO crawl_bid_state (run_id, bid_id, stage, bid_info)
+    VALUES %s
+    ON CONFLICT (run_id, bid_id)
+    DO UPDATE SET
+        stage = EXCLUDED.stage,
+        bid_info = CASE WHEN EXCLUDED.stage = 'saved' THEN NULL
+                        ELSE COALESCE(EXCLUDED.bid_info, crawl_bid_state.bid_info) END,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+CRAWL_LISTING_STATE_SQL = """
+    INSERT INTO crawl_listing_state (run_id, filter_key, filters, last_completed_page, last_page)
+    VALUES %s
+    ON CONFLICT (run_id, filter_key)
+    DO UPDATE SET
+        last_completed_page = EXCLUDED.last_completed_page,
+        last_page = EXCLUDED.last_page,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+def listing_filter_key(listing_filter: Dict[str, Any]) -> str:
+    """Stable short key of a listing filter"""
+    return hashlib.sha1(json.dumps(listing_filter, sort_keys=True).encode()).hexdigest()[:16]
+
+class ListingProgress:
+    """Listing progress of one filter slice (e.g. one end date window) of a crawl run"""
+
+    def __init__(self, listing_filter: Dict[str, Any], last_completed_page: int, last_page: Optional[int] = None):
+        self.listing_filter = listing_filter
+        self.filter_key = listing_filter_key(listing_filter)
+        # Every page up to last_completed_page is listed; later pages that finished out of order
+        self.last_completed_page = last_completed_page
+        self.completed_pages: set = set()
+        self.last_page = last_page
+        self.dirty = False
+
+class CrawlCheckpoint:
+    """
+    Crawl progress persisted in Postgres so an interrupted run can be resumed.
+    Records the run parameters and listing filter, for each listed filter slice the last
+    page up to which every page is done, and the stage each bid reached. Marks are buffered
+    in memory and written in one transaction by flush(), which the database stage calls
+    after each batch.
+    """
+
+    def __init__(self, scraper: "GeMBidScraper", run_id: str, params: Dict[str, Any],
+                 listing_filter: Dict[str, Any], status: str = "running"):
+        self.scraper = scraper
+        self.run_id = run_id
+        self.params = params
+        self.listing_filter = listing_filter
+        self.status = status
+        self.lock = threading.Lock()
+        # bid id -> (stage, listing bid_info or None), only marks not yet written
+        self.stages: Dict[str, Tuple[str, Optional[Dict[str, Any]]]] = {}
+        # filter key -> progress of every slice listed so far
+        self.listings: Dict[str, ListingProgress] = {}
+        # Filled by load(): bids saved by the interrupted run, and bids it listed but never saved
+        self.done_ids: set = set()
+        self.pending_bids: List[Dict[str, Any]] = []
+
+    @classmethod
+    def create(cls, scraper: "GeMBidScraper", params: Dict[str, Any], listing_filter: Dict[str, Any]) -> "CrawlCheckpoint":
+        """Register a new run"""
+        run_id = datetime.now().strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        params = dict(params, listing_filter=listing_filter)
+        checkpoint = cls(scraper, run_id, params, listing_filter)
+
+        def insert(conn):
+            with conn.cursor() as cur:
+                cur.execute("INSERT INTO crawl_runs (run_id, status, params) VALUES (%s, 'running', %s)",
+                            (run_id, json.dumps(params)))
+
+        scraper.db.run(insert)
+        return checkpoint
+
+    @classmethod
+    def load(cls, scraper: "GeMBidScraper", run_id: Optional[str] = None) -> Optional["CrawlCheckpoint"]:
+        """Reopen a run (the latest unfinished one without run_id), None if there is none"""
+        def query(conn):
+            with conn.cursor() as cur:
+                if run_id is None:
+                    cur.execute("""
+                        SELECT run_id, status, params FROM crawl_runs
+                        WHERE status <> 'completed' ORDER BY created_at DESC LIMIT 1
+                    """)
+                else:
+                    cur.execute("SELECT run_id, status, params FROM crawl_runs WHERE run_id = %s", (run_id,))
+                run = cur.fetchone()
+                if run is None:
+                    return None
+
+                cur.execute("""
+                    SELECT filters, last_completed_page, last_page FROM crawl_listing_state
+                    WHERE run_id = %s ORDER BY updated_at DESC
+                """, (run[0],))
+                listings = cur.fetchall()
+                cur.execute("SELECT bid_id, stage, bid_info FROM crawl_bid_state WHERE run_id = %s", (run[0],))
+                return run, listings, cur.fetchall()
+
+        loaded = scraper.db.run(query)
+        if loaded is None:
+            return None
+
+        (found_run_id, status, params), listings, bids = loaded
+        # Runs recorded before params carried the filter have exactly one listing slice
+        listing_filter = params.get("listing_filter") or (listings[0][0] if listings else scraper.listing_filter)
+        checkpoint = cls(scraper, found_run_id, params, listing_filter, status)
+        for filters, last_completed_page, last_page in listings:
+            listing = ListingProgress(filters, last_completed_page, last_page)
+            checkpoint.listings[listing.filter_key] = listing
+        for bid_id, stage, bid_info in bids:
+            if stage == "saved":
+                checkpoint.done_ids.add(bid_id)
+            elif bid_info:
+                checkpoint.pending_bids.append(bid_info)
+        return checkpoint
+
+    def mark(self, bid_id: Any, stage: str, bid_info: Optional[Dict[str, Any]] = None):
+        """Record that a bid reached a stage (bid_info is stored with 'listed' so it can be re-queued)"""
+        if bid_id is None:
+            return
+        with self.lock:
+            previous = self.stages.get(str(bid_id))
+            if bid_info is None and previous is not None and stage != "saved":
+                bid_info = previous[1]
+            self.stages[str(bid_id)] = (stage, bid_info)
+
+    def mark_saved(self, bid_ids: List[Any]):
+        for bid_id in bid_ids:
+            self.mark(bid_id, "saved")
+
+    def listing(self, listing_filter: Dict[str, Any], start_page: int = 1) -> ListingProgress:
+        """Progress of a filter slice, registered (from start_page) the first time it is listed"""
+        key = listing_filter_key(listing_filter)
+        with self.lock:
+            if key not in self.listings:
+                listing = ListingProgress(listing_filter, start_page - 1)
+                listing.dirty = True
+                self.listings[key] = listing
+            return self.listings[key]
+
+    def page_done(self, listing: ListingProgress, page: int):
+        """A listing page had all of its bids queued, advance the contiguous watermark"""
+        with self.lock:
+            listing.completed_pages.add(page)
+            while listing.last_completed_page + 1 in listing.completed_pages:
+                listing.last_completed_page += 1
+                listing.completed_pages.discard(listing.last_completed_page)
+            listing.dirty = True
+
+    def set_last_page(self, listing: ListingProgress, last_page: int):
+        with self.lock:
+            listing.last_page = last_page
+            listing.dirty = True
+
+    def listing_complete(self, listing: ListingProgress):
+        """A slice finished without failed pages, a resume only has to finish its queued bids"""
+        with self.lock:
+            if listing.last_page is not None:
+                listing.last_completed_page = max(listing.last_completed_page, listing.last_page)
+            listing.completed_pages.clear()
+            listing.dirty = True
+
+    def has_pending(self) -> bool:
+        return bool(self.stages) or any(listing.dirty for listing in self.listings.values())
+
+    def flush(self):
+        """Write buffered marks and the listing watermarks in one transaction"""
+        with self.lock:
+            stages, self.stages = self.stages, {}
+            dirty = [listing for listing in self.listings.values() if listing.dirty]
+            listings = [(self.run_id, listing.filter_key, json.dumps(listing.listing_filter),
+                         listing.last_completed_page, listing.last_page) for listing in dirty]
+            for listing in dirty:
+                listing.dirty = False
+        if not stages and not listings:
+            return
+
+        def write(conn):
+            with conn.cursor() as cur:
+                if stages:
+                    rows = [(self.run_id, bid_id, stage, json.dumps(bid_info) if bid_info else None)
+                            for bid_id, (stage, bid_info) in stages.items()]
+                    psycopg2.extras.execute_values(cur, CRAWL_BID_STATE_SQL, rows, page_size=max(1, len(rows)))
+                if listings:
+                    psycopg2.extras.execute_values(cur, CRAWL_LISTING_STATE_SQL, listings, page_size=len(listings))
+                cur.execute("UPDATE crawl_runs SET updated_at = CURRENT_TIMESTAMP WHERE run_id = %s", (self.run_id,))
+
+        try:
+            self.scraper.db.run(write)
+        except Exception as e:
+            log_event(logging.ERROR, "checkpoint_save_failed", run_id=self.run_id, error=str(e))
+            # Put the marks back under any newer ones so the next flush retries them
+            with self.lock:
+                for bid_id, (stage, bid_info) in stages.items():
+                    newer = self.stages.get(bid_id)
+                    if newer is None:
+                        self.stages[bid_id] = (stage, bid_info)
+                    elif newer[1] is None and newer[0] != "saved":
+                        self.stages[bid_id] = (newer[0], bid_info)
+                for listing in dirty:
+                    listing.dirty = True
+
+    def finish(self, status: str):
+        """Flush and record the final run status, a completed run drops its per-bid rows"""
+        self.flush()
+        self.status = status
+
+        def update(conn):
+            with conn.cursor() as cur:
+                cur.execute("UPDATE crawl_runs SET status = %s, updated_at = CURRENT_TIMESTAMP WHERE run_id = %s",
+                            (status, self.run_id))
+                if status == "completed":
+                    cur.execute("DELETE FROM crawl_bid_state WHERE run_id = %s", (self.run_id,))
+
+        try:
+            self.scraper.db.run(update)
+        except Exception as e:
+            log_event(logging.ERROR, "crawl_run_update_failed", run_id=self.run_id, error=str(e))
+
+class ParseProfiler:
+    """
+    Opt-in per-page parser profiling. Times each extraction path of a result view page
+    (document parse, panel walk, table.table scan, regex fallback, ...); a page slower than
+    threshold_ms is parsed again under cProfile and its HTML, profile and phase timings are
+    saved to capture_dir, at most max_captures pages per process
+    """
+    
+    def __init__(self, enabled: bool = False, threshold_ms: float = 100.0,
+                 capture_dir: str = os.path.join('cache', 'parse_profiles'), max_captures: int = 50):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.captured = 0
+        self.configure(enabled, threshold_ms, capture_dir, max_captures)
+    
+    def configure(self, enabled: bool, threshold_ms: float, capture_dir: str, max_captures: int):
+        self.enabled = enabled
+        self.threshold_ms = threshold_ms
+        self.capture_dir = capture_dir
+        self.max_captures = max_captures
+    
+    def settings(self) -> Tuple[bool, float, str, int]:
+        """configure() arguments, handed to parse worker processes"""
+        return self.enabled, self.threshold_ms, self.capture_dir, self.max_captures
+    
+    @contextmanager
+    def page(self):
+        """Collect the phase timings of one page parse into the yielded {phase: seconds} dict"""
+        timings: Dict[str, float] = {}
+        self.local.timings = timings if self.enabled else None
+        try:
+            yield timings
+        finally:
+            self.local.timings = None
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Time an extraction path of the page being parsed (no-op unless profiling)"""
+        timings = getattr(self.local, "timings", None)
+        if timings is None:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+    
+    def capture(self, html_content: str, bid_id: str, backend: str, seconds: float, timings: Dict[str, float],
+                sellers: int, parse_again) -> Optional[str]:
+        """
+        Save a slow page: <prefix>.html, a cProfile of parse_again() as <prefix>.prof (pstats format)
+        with its top functions in <prefix>.txt, and the phase timings in <prefix>.json.
+        Returns the prefix, or None once max_captures pages were saved
+        """
+        with self.lock:
+            if self.captured >= self.max_captures:
+                return None
+            self.captured += 1
+        
+        os.makedirs(self.capture_dir, exist_ok=True)
+        safe_id = re.sub(r'[^\w.-]', '_', str(bid_id))
+        prefix = os.path.join(self.capture_dir, f"{datetime.now():%Y%m%d-%H%M%S}_{safe_id}_{backend}")
+        
+        import cProfile
+        import pstats
+        
+        profile = cProfile.Profile()
+        profile.runcall(parse_again)
+        profile.dump_stats(prefix + ".prof")
+        report = io.StringIO()
+        pstats.Stats(profile, stream=report).sort_stats("cumulative").print_stats(30)
+        
+        with open(prefix + ".html", "w", encoding="utf-8") as f:
+            f.write(html_content)
+        with open(prefix + ".txt", "w", encoding="utf-8") as f:
+            f.write(report.getvalue())
+        with open(prefix + ".json", "w", encoding="utf-8") as f:
+            json.dump({
+                "bid_id": bid_id,
+                "backend": backend,
+                "parse_ms": round(seconds * 1000, 3),
+                "threshold_ms": self.threshold_ms,
+                "html_bytes": len(html_content.encode("utf-8", "replace")),
+                "sellers": sellers,
+                "phases_ms": {phase: round(value * 1000, 3) for phase, value in timings.items()}
+            }, f, indent=2)
+            f.write("\n")
+        return prefix
+
+class LxmlEvaluationExtractor:
+    """
+    Fast result view parser on lxml (libxml2). Produces the same sellers_participated as
+    the BeautifulSoup extraction in GeMBidScraper, but classifies panels and collects every
+    seller table in a single walk over the document instead of re-searching each panel.
+    """
+    
+    TECHNICAL_TERMS = ['TECHNICAL', 'TECH EVAL', 'TECHNICAL EVALUATION']
+    FINANCIAL_TERMS = ['FINANCIAL', 'FIN EVAL', 'FINANCIAL EVALUATION']
+    FINANCIAL_LABELS = ['List of Sellers Qualified Financially', 'Financial Evaluation', 'Price Comparison']
+    
+    def __init__(self, clean_seller_name, profiler: Optional[ParseProfiler] = None):
+        self.clean_seller_name = clean_seller_name
+        self.profiler = profiler or ParseProfiler()
+    
+    def parse(self, html_content: str):
+        """Parse a result view page into an lxml document"""
+        # Plain etree elements: lxml.html's per-element class lookup costs more than the parse itself
+        parser = lxml_etree.HTMLParser(encoding="utf-8")
+        root = lxml_etree.fromstring(html_content.encode("utf-8", "replace"), parser=parser)
+        if root is None:
+            raise ValueError("Document is empty")
+        
+        # BeautifulSoup leaves script/style contents out of get_text(). Empty them in place rather than
+        # removing them: merging their tail into the text before would join strings bs4 strips separately
+        for element in root.xpath("//script | //style"):
+            element.text = None
+        return root
+    
+    def has_class(self, element, class_name: str) -> bool:
+        return class_name in (element.get("class") or "").split()
+    
+    def get_text(self, element, strip: bool = False) -> str:
+        """Same result as BeautifulSoup's get_text() / get_text(strip=True)"""
+        if strip:
+            return "".join(text.strip() for text in element.itertext() if text.strip())
+        return "".join(element.itertext())
+    
+    def get_string(self, element) -> Optional[str]:
+        """Same result as BeautifulSoup's .string: the only child string, or None"""
+        children = list(element)
+        if element.text:
+            return element.text if not children else None
+        if len(children) != 1 or children[0].tail:
+            return None
+        child = children[0]
+        if not isinstance(child.tag, str):
+            # Comments count as strings in BeautifulSoup
+            return child.text
+        return self.get_string(child)
+    
+    def find(self, element, tag: str, class_name: Optional[str] = None):
+        for descendant in element.iterdescendants(tag):
+            if class_name is None or self.has_class(descendant, class_name):
+                return descendant
+        return None
+    
+    def find_all(self, element, tag: str, class_name: Optional[str] = None) -> List[Any]:
+        return [descendant for descendant in element.iterdescendants(tag)
+                if class_name is None or self.has_class(descendant, class_name)]
+    
+    def classify_heading(self, heading_text: str) -> Optional[str]:
+        """Evaluation type of a panel heading, same rules as extract_all_evaluations"""
+        upper_text = heading_text.upper()
+        if any(term in upper_text for term in self.TECHNICAL_TERMS):
+            return "technical"
+        if any(term in upper_text for term in self.FINANCIAL_TERMS):
+            return "financial"
+        if 'EVALUATION' in upper_text:
+            return "general"
+        return None
+    
+    def scan_document(self, root) -> Tuple[List[Tuple[str, Optional[str], Optional[Dict[str, list]]]], List[Any]]:
+        """
+        One walk over the document. Returns the panel headings in order as
+        (heading text, evaluation type, panel tables) and every table.table for the fallback.
+        Panel tables hold the first table of each technical_eligible section ("technical")
+        and the next table after each financial label ("financial"), per enclosing panel
+        """
+        headings = []
+        fallback_tables = []
+        # Open div.panel ancestors; their table lists also receive tables of nested panels
+        panel_stack: List[Tuple[Any, Dict[str, list]]] = []
+        # Open technical_eligible sections still waiting for their first table
+        open_sections: List[Tuple[Any, List[Dict[str, list]], List[bool]]] = []
+        # Financial labels waiting for the next table in document order
+        pending_labels: List[List[Dict[str, list]]] = []
+        
+        for event, element in lxml_etree.iterwalk(root, events=("start", "end")):
+            tag = element.tag
+            
+            if event == "end":
+                if tag == "div":
+                    if panel_stack and panel_stack[-1][0] is element:
+                        panel_stack.pop()
+                    if open_sections and open_sections[-1][0] is element:
+                        open_sections.pop()
+                continue
+            
+            if tag == "div":
+                classes = (element.get("class") or "").split()
+                if "panel-heading" in classes:
+                    # The heading's own panel class does not count, like find_parent
+                    heading_text = self.get_text(element).strip()
+                    panel_tables = panel_stack[-1][1] if panel_stack else None
+                    headings.append((heading_text, self.classify_heading(heading_text), panel_tables))
+                if "panel" in classes:
+                    panel_stack.append((element, {"technical": [], "financial": []}))
+                if "technical_eligible" in classes:
+                    open_sections.append((element, [tables for _, tables in panel_stack], [False]))
+            
+            elif tag == "label" and panel_stack:
+                text = self.get_string(element)
+                if text and any(phrase in text for phrase in self.FINANCIAL_LABELS):
+                    pending_labels.append([tables for _, tables in panel_stack])
+            
+            elif tag == "table":
+                if self.has_class(element, "table"):
+                    fallback_tables.append(element)
+                
+                for _, panels, found in open_sections:
+                    if not found[0]:
+                        found[0] = True
+                        for tables in panels:
+                            tables["technical"].append(element)
+                
+                for panels in pending_labels:
+                    for tables in panels:
+                        tables["financial"].append(element)
+                pending_labels = []
+        
+        return headings, fallback_tables
+    
+    def extract_all_evaluations(self, root, evaluation_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Single-pass equivalent of GeMBidScraper.extract_all_evaluations"""
+        all_sellers = []
+        # Each table is read once per evaluation type even if several headings share a panel
+        table_rows: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
+        
+        def rows_for(table, evaluation_type: str) -> List[Dict[str, Any]]:
+            key = (id(table), evaluation_type)
+            if key not in table_rows:
+                if evaluation_type == "technical":
+                    table_rows[key] = self.extract_technical_rows(table)
+                elif evaluation_type == "financial":
+                    table_rows[key] = self.extract_financial_rows(table)
+                else:
+                    table_rows[key] = self.extract_sellers_from_table(table)
+                    for seller in table_rows[key]:
+                        seller["evaluation_type"] = "general"
+            return [dict(seller) for seller in table_rows[key]]
+        
+        with self.profiler.phase("panels"):
+            headings, fallback_tables = self.scan_document(root)
+            for heading_text, evaluation_type, panel_tables in headings:
+                log_event(logging.DEBUG, "panel_heading", heading=heading_text)
+                if evaluation_type is None:
+                    continue
+                
+                evaluation_data[f"has_{evaluation_type}_evaluation"] = True
+                sellers = []
+                if panel_tables is not None:
+                    source = "financial" if evaluation_type == "financial" else "technical"
+                    for table in panel_tables[source]:
+                        sellers.extend(rows_for(table, evaluation_type))
+                all_sellers.extend(sellers)
+                log_event(logging.DEBUG, "evaluations_extracted", evaluation_type=evaluation_type, sellers=len(sellers))
+        
+        # Also look for tables directly without panel headings
+        if not evaluation_data["has_general_evaluation"] and not evaluation_data["has_financial_evaluation"]:
+            with self.profiler.phase("table_scan"):
+                for table in fallback_tables:
+                    if self.is_evaluation_table(table):
+                        sellers = self.extract_sellers_from_table(table)
+                        if sellers:
+                            all_sellers.extend(sellers)
+                            evaluation_data["has_general_evaluation"] = True
+                            log_event(logging.DEBUG, "evaluation_table", sellers=len(sellers))
+        
+        evaluation_data["sellers_participated"] = all_sellers
+        
+        return evaluation_data
+    
+    def is_evaluation_table(self, table) -> bool:
+        header_row = self.find(table, "tr")
+        if header_row is not None:
+            header_text = self.get_text(header_row).upper()
+            return any(term in header_text for term in [
+                'SELLER', 'VENDOR', 'BIDDER', 'RANK', 'PRICE', 'STATUS', 'QUALIFIED'
+            ])
+        return False
+    
+    def extract_sellers_from_table(self, table) -> List[Dict[str, Any]]:
+        """Port of GeMBidScraper.extract_sellers_from_table"""
+        sellers = []
+        rows = self.find_all(table, "tr")
+        if len(rows) < 2:
+            return sellers
+        
+        headers = [self.get_text(cell).strip().upper() for cell in rows[0].iterdescendants("th", "td")]
+        
+        seller_col = next((i for i, h in enumerate(headers) if 'SELLER' in h or 'VENDOR' in h or 'NAME' in h), 1)
+        price_col = next((i for i, h in enumerate(headers) if 'PRICE' in h or 'AMOUNT' in h), -1)
+        rank_col = next((i for i, h in enumerate(headers) if 'RANK' in h), -1)
+        status_col = next((i for i, h in enumerate(headers) if 'STATUS' in h), -1)
+        
+        for row in rows[1:]:
+            cells = self.find_all(row, "td")
+            if len(cells) > seller_col:
+                seller_info = {
+                    "s_no": self.get_text(cells[0], strip=True) if len(cells) > 0 else "",
+                    "seller_name": self.clean_seller_name(self.get_text(cells[seller_col])),
+                    "offered_item": self.get_text(cells[2], strip=True) if len(cells) > 2 else "",
+                }
+                
+                if price_col >= 0 and len(cells) > price_col:
+                    price_span = self.find(cells[price_col], "span", "bid_price")
+                    seller_info["total_price"] = self.get_text(price_span if price_span is not None else cells[price_col], strip=True)
+                
+                if rank_col >= 0 and len(cells) > rank_col:
+                    rank_strong = self.find(cells[rank_col], "strong")
+                    seller_info["rank"] = self.get_text(rank_strong if rank_strong is not None else cells[rank_col], strip=True)
+                
+                if status_col >= 0 and len(cells) > status_col:
+                    status_span = self.find(cells[status_col], "span")
+                    seller_info["status"] = self.get_text(status_span if status_span is not None else cells[status_col], strip=True)
+                
+                sellers.append(seller_info)
+        
+        return sellers
+    
+    def extract_technical_rows(self, table) -> List[Dict[str, Any]]:
+        """Technical evaluation rows of one technical_eligible table"""
+        technical_sellers = []
+        
+        for row in self.find_all(table, "tr")[1:]:
+            cells = self.find_all(row, "td")
+            if len(cells) < 6:
+                continue
+            
+            seller_name_span = self.find(cells[1], "span", "cid")
+            raw_name = self.get_text(seller_name_span if seller_name_span is not None else cells[1], strip=True)
+            
+            emd_status_span = self.find(cells[4], "span")
+            emd_status = self.get_text(emd_status_span if emd_status_span is not None else cells[4], strip=True)
+            
+            mse_status = ", ".join(self.get_text(label, strip=True) for label in self.find_all(cells[5], "span", "label"))
+            
+            status_span = self.find(cells[-1], "span")
+            if status_span is not None:
+                status_text = self.get_text(status_span, strip=True)
+                if 'Qualified' in status_text:
+                    status = "Qualified"
+                elif 'Disqualified' in status_text:
+                    status = "Disqualified"
+                else:
+                    status = status_text
+            else:
+                status = self.get_text(cells[-1], strip=True)
+            
+            technical_sellers.append({
+                "s_no": self.get_text(cells[0], strip=True),
+                "seller_name": self.clean_seller_name(raw_name),
+                "offered_item": self.get_text(cells[2], strip=True),
+                "participated_on": self.get_text(cells[3], strip=True),
+                "emd_status": emd_status,
+                "mse_status": mse_status,
+                "status": status,
+                "evaluation_type": "technical"
+            })
+        
+        return technical_sellers
+    
+    def extract_financial_rows(self, table) -> List[Dict[str, Any]]:
+        """Financial evaluation rows of the table following a financial label"""
+        financial_sellers = []
+        
+        for row in self.find_all(table, "tr")[1:]:
+            cells = self.find_all(row, "td")
+            if len(cells) < 4:
+                continue
+            
+            price_span = self.find(cells[3], "span", "bid_price")
+            price = self.get_text(price_span if price_span is not None else cells[3], strip=True)
+            
+            rank = ""
+            if len(cells) > 4:
+                rank_strong = self.find(cells[4], "strong")
+                rank = self.get_text(rank_strong if rank_strong is not None else cells[4], strip=True)
+            
+            financial_sellers.append({
+                "s_no": self.get_text(cells[0], strip=True),
+                "seller_name": self.clean_seller_name(self.get_text(cells[1])),
+                "offered_item": self.get_text(cells[2], strip=True),
+                "total_price": price,
+                "rank": rank,
+                "evaluation_type": "financial"
+            })
+        
+        return financial_sellers
+
+class ResultViewCache:
+    """
+    Raw result view pages on disk, keyed by (endpoint, bid id), in a local SQLite file.
+    Bodies are zlib-compressed and stored once per content hash. Entries younger than ttl
+    are served without a request, older ones are revalidated with their ETag/Last-Modified.
+    Least recently used entries are evicted once the stored bodies exceed max_bytes.
+    """
+    
+    def __init__(self, path: str, max_bytes: int, ttl: float):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        # One connection shared by the event loop's worker threads, serialized by the lock
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    content_hash TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                
+                CREATE TABLE IF NOT EXISTS entries (
+                    endpoint TEXT NOT NULL,
+                    bid_id TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (endpoint, bid_id)
+                );
+                
+                CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at);
+                CREATE INDEX IF NOT EXISTS idx_entries_hash ON entries(content_hash);
+            """)
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+    
+    def get(self, endpoint: str, bid_id: str, touch: bool = True) -> Optional[Dict[str, Any]]:
+        """Cached page as {body, etag, last_modified, fresh}, None on a miss"""
+        with self.lock:
+            row = self.conn.execute("""
+                SELECT e.etag, e.last_modified, e.fetched_at, p.body
+                FROM entries e JOIN pages p ON p.content_hash = e.content_hash
+                WHERE e.endpoint = ? AND e.bid_id = ?
+            """, (endpoint, bid_id)).fetchone()
+            if row is None:
+                return None
+            if touch:
+                with self.conn:
+                    self.conn.execute("UPDATE entries SET accessed_at = ? WHERE endpoint = ? AND bid_id = ?",
+                                      (time.time(), endpoint, bid_id))
+        
+        etag, last_modified, fetched_at, body = row
+        return {
+            "body": zlib.decompress(body).decode("utf-8"),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": time.time() - fetched_at < self.ttl
+        }
+    
+    def validators(self, cached: Dict[str, Any]) -> Dict[str, str]:
+        """Conditional request headers for a stale entry"""
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+    
+    def revalidated(self, endpoint: str, bid_id: str):
+        """The server answered 304 Not Modified: the entry is fresh again"""
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE entries SET fetched_at = ? WHERE endpoint = ? AND bid_id = ?",
+                              (time.time(), endpoint, bid_id))
+    
+    def put(self, endpoint: str, bid_id: str, body: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None):
+        """Store a downloaded page, then evict old entries if the cache is over its size bound"""
+        data = body.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        compressed = zlib.compress(data, 6)
+        now = time.time()
+        
+        with self.lock, self.conn:
+            previous = self.conn.execute("SELECT content_hash FROM entries WHERE endpoint = ? AND bid_id = ?",
+                                         (endpoint, bid_id)).fetchone()
+            inserted = self.conn.execute("INSERT OR IGNORE INTO pages (content_hash, body, size) VALUES (?, ?, ?)",
+                                         (content_hash, compressed, len(compressed)))
+            if inserted.rowcount:
+                self.total_bytes += len(compressed)
+            self.conn.execute("""
+                INSERT OR REPLACE INTO entries
+                (endpoint, bid_id, content_hash, etag, last_modified, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (endpoint, bid_id, content_hash, etag, last_modified, now, now))
+            if previous and previous[0] != content_hash:
+                self.drop_unreferenced([previous[0]])
+            self.evict()
+    
+    def evict(self):
+        """Drop least recently used entries until the bodies fit in max_bytes (lock held)"""
+        while self.total_bytes > self.max_bytes:
+            oldest = self.conn.execute("""
+                SELECT endpoint, bid_id, content_hash FROM entries ORDER BY accessed_at LIMIT 100
+            """).fetchall()
+            if not oldest:
+                break
+            for endpoint, bid_id, content_hash in oldest:
+                self.conn.execute("DELETE FROM entries WHERE endpoint = ? AND bid_id = ?", (endpoint, bid_id))
+                self.drop_unreferenced([content_hash])
+                if self.total_bytes <= self.max_bytes:
+                    break
+    
+    def drop_unreferenced(self, content_hashes):
+        """Delete bodies no entry points to any more (lock held)"""
+        for content_hash in content_hashes:
+            if self.conn.execute("SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (content_hash,)).fetchone():
+                continue
+            row = self.conn.execute("SELECT size FROM pages WHERE content_hash = ?", (content_hash,)).fetchone()
+            if row:
+                self.conn.execute("DELETE FROM pages WHERE content_hash = ?", (content_hash,))
+                self.total_bytes -= row[0]
+    
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {"entries": entries, "bytes": self.total_bytes, "max_bytes": self.max_bytes}
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+class ParentEvaluationCache:
+    """
+    Parent result views keyed by parent bid id, shared by all bids of a run so a parent
+    with many children is fetched and parsed once. Concurrent lookups of the same parent
+    wait on one in-flight fetch. Failed fetches are not kept, a later child retries them.
+    With persist, parents that have evaluations are also stored in parent_evaluations
+    and reused by later runs for ttl seconds
+    """
+    
+    def __init__(self, scraper: "GeMBidScraper", persist: bool = False, ttl: float = 7 * 24 * 3600):
+        self.scraper = scraper
+        self.persist = persist
+        self.ttl = ttl
+        self.entries: Dict[str, asyncio.Future] = {}
+        self.fetched = 0
+        self.reused = 0
+        self.loaded = 0
+    
+    async def get(self, http: aiohttp.ClientSession, parent_id: str) -> Optional[Dict[str, Any]]:
+        """Parent result view, fetching it only if no other bid has (or is)"""
+        future = self.entries.get(parent_id)
+        if future is not None:
+            self.reused += 1
+            # shield: a cancelled child must not cancel the fetch other children wait on
+            return await asyncio.shield(future)
+        
+        future = asyncio.get_running_loop().create_future()
+        self.entries[parent_id] = future
+        result = None
+        try:
+            result = await self.load(http, parent_id)
+        finally:
+            if result is None:
+                del self.entries[parent_id]
+            future.set_result(result)
+        return result
+    
+    async def load(self, http: aiohttp.ClientSession, parent_id: str) -> Optional[Dict[str, Any]]:
+        if self.persist:
+            stored = await asyncio.to_thread(self.load_stored, parent_id)
+            if stored is not None:
+                self.loaded += 1
+                return stored
+        
+        self.fetched += 1
+        result = await self.scraper.get_bid_result_view_async(http, parent_id, is_parent=True)
+        if self.persist and self.scraper.has_any_evaluation(result):
+            await asyncio.to_thread(self.store, parent_id, result)
+        return result
+    
+    def load_stored(self, parent_id: str) -> Optional[Dict[str, Any]]:
+        def query(conn):
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT evaluation FROM parent_evaluations
+                    WHERE parent_id = %s AND updated_at >= NOW() - %s * INTERVAL '1 second'
+                """, (parent_id, self.ttl))
+                row = cur.fetchone()
+                return row[0] if row else None
+        
+        try:
+            return self.scraper.db.run(query)
+        except Exception as e:
+            log_event(logging.WARNING, "parent_evaluation_read_failed", parent_id=parent_id, error=str(e))
+            return None
+    
+    def store(self, parent_id: str, result: Dict[str, Any]):
+        evaluation = json.dumps(self.scraper.prepare_evaluation_for_database(result))
+        
+        def upsert(conn):
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO parent_evaluations (parent_id, evaluation) VALUES (%s, %s)
+                    ON CONFLICT (parent_id)
+                    DO UPDATE SET evaluation = EXCLUDED.evaluation, updated_at = CURRENT_TIMESTAMP
+                """, (parent_id, evaluation))
+        
+        try:
+            self.scraper.db.run(upsert)
+        except Exception as e:
+            log_event(logging.WARNING, "parent_evaluation_store_failed", parent_id=parent_id, error=str(e))
+    
+    def describe(self) -> str:
+        text = f"{self.fetched} parent views fetched, {self.reused} reused"
+        if self.persist:
+            text += f", {self.loaded} loaded from database"
+        return text
 
-load_dotenv()
+# Version of the schema built by create_schema. Bump it with every DDL change: databases
+# already at this version skip the DDL when the scraper starts
+SCHEMA_VERSION = 1
 
 class GeMBidScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.base_url = "https://bidplus.gem.gov.in"
+    def __init__(self, init_database: bool = True):
+        load_environment()
+        # Site root, GEM_BASE_URL points the crawler at a local mock (benchmarks/mock_gem_server.py)
+        self.base_url = os.getenv('GEM_BASE_URL', "https://bidplus.gem.gov.in").rstrip('/')
         self.all_bids_data = []
         
         # Hardcoded database configuration
@@ -42,58 +1748,417 @@ class GeMBidScraper:
         self.cookie_value = os.getenv('GEM_COOKIE')
         self.csrf_token = os.getenv('CSRF_TOKEN')
         
-        self.setup_database()
+        # Pooled connections shared by every database path
+        self.db = DatabasePool(self.db_config, maxconn=int(os.getenv('DB_POOL_SIZE', '5')))
+        
+        # Number of bids whose result views are fetched at the same time
+        self.concurrency = int(os.getenv('SCRAPER_CONCURRENCY', '10'))
+        
+        # Shared rate limiter used by every outgoing request
+        self.rate_limiter = AdaptiveRateLimiter()
+        
+        # Structured logs (see configure_logging): progress and errors by default, per-bid detail
+        # sampled at DEBUG, every seller of each bid only with LOG_SELLERS=1
+        if not logger.handlers:
+            configure_logging()
+        self.log_sellers = os.getenv('LOG_SELLERS', '0') == '1'
+        self.log_progress_interval = float(os.getenv('LOG_PROGRESS_SECONDS', '10'))
+        
+        # Per-stage counters and latency histograms, served on /metrics when METRICS_PORT is set
+        self.metrics = CrawlMetrics()
+        self.metrics_port = int(os.getenv('METRICS_PORT', '0'))
+        
+        # Streaming pipeline settings: parallel listing pages and bounded queue size between stages
+        self.listing_concurrency = int(os.getenv('LISTING_CONCURRENCY', '4'))
+        self.queue_size = int(os.getenv('PIPELINE_QUEUE_SIZE', '100'))
+        
+        # HTTP transport: timeouts in seconds, GET and listing retries with jittered exponential backoff (session made on first use)
+        self.connect_timeout = float(os.getenv('HTTP_CONNECT_TIMEOUT', '10'))
+        self.read_timeout = float(os.getenv('HTTP_READ_TIMEOUT', '60'))
+        self.request_retries = int(os.getenv('HTTP_RETRIES', '3'))
+        self.retry_backoff = float(os.getenv('HTTP_RETRY_BACKOFF', '0.5'))
+        self.retry_backoff_max = float(os.getenv('HTTP_RETRY_BACKOFF_MAX', '30'))
+        self.session: Optional[requests.Session] = None
+        
+        # Header sets built once per endpoint, result views only add a per-bid Referer
+        self.listing_headers = self.get_listing_headers()
+        self.result_view_headers = {
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Cookie": self.cookie_value,
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36 Edg/138.0.0.0"
+        }
+        
+        # Bulk upsert batching: rows per statement and max seconds a row waits in the buffer
+        self.db_batch_size = int(os.getenv('DB_BATCH_SIZE', '200'))
+        self.db_flush_interval = float(os.getenv('DB_FLUSH_INTERVAL', '2.0'))
+        
+        # Incremental mode stops listing after this many consecutive pages of already stored bids
+        self.incremental_stop_pages = int(os.getenv('INCREMENTAL_STOP_PAGES', '3'))
+        
+        # Listing filter (bid status and end date window); a resumed run restores its own
+        self.listing_filter = copy.deepcopy(DEFAULT_LISTING_FILTER)
+        # Date-range crawls split end date windows until each has at most this many bids
+        self.listing_window_max_results = int(os.getenv('LISTING_WINDOW_MAX_RESULTS', '1000'))
+        
+        # Record crawl progress in Postgres so interrupted runs can be resumed
+        self.checkpoints_enabled = os.getenv('CRAWL_CHECKPOINTS', '1') != '0'
+        
+        # Raw result view cache (empty path disables it), opened on first use
+        self.result_cache_path = os.getenv('RESULT_CACHE_PATH', os.path.join('cache', 'result_views.sqlite3'))
+        self.result_cache_max_bytes = int(float(os.getenv('RESULT_CACHE_MAX_MB', '2048')) * 1024 * 1024)
+        self.result_cache_ttl = float(os.getenv('RESULT_CACHE_TTL_HOURS', '168')) * 3600
+        self.result_cache: Optional[ResultViewCache] = None
+        # Cache operations run in worker threads, this lock makes disabling the cache happen once
+        self.result_cache_lock = threading.Lock()
+        
+        # Parent result views are fetched once per run; optionally kept in Postgres across runs
+        self.parent_cache_persist = os.getenv('PARENT_CACHE_PERSIST', '0') == '1'
+        self.parent_cache_ttl = float(os.getenv('PARENT_CACHE_TTL_HOURS', '168')) * 3600
+        self.parent_cache: Optional[ParentEvaluationCache] = None
+        
+        # Monthly RANGE partitions of bid_evaluations on end_date for new databases
+        # (migrate an existing table with the migrate-partitions command); set from the real table by setup_database
+        self.db_partitioned = os.getenv('DB_PARTITIONED', '0') == '1'
+        self.partition_months_ahead = int(os.getenv('PARTITION_MONTHS_AHEAD', '3'))
+        self.partitioned_table = False
+        self.known_partitions: set = set()
+        
+        # Result view parsing runs in this many worker processes during a crawl (0 parses inline)
+        self.parse_worker_count = int(os.getenv('PARSE_WORKERS', str(os.cpu_count() or 1)))
+        self.parse_executor: Optional[ProcessPoolExecutor] = None
+        
+        # HTML parser backend for result views: 'lxml' (fast, default) or 'bs4'
+        self.parser_backend = self.resolve_parser_backend(os.getenv('PARSER_BACKEND', 'lxml'))
+        # Opt-in parser profiling: per-path timings, and pages slower than PARSE_PROFILE_THRESHOLD_MS
+        # saved with a cProfile to PARSE_PROFILE_DIR for parser work
+        self.parse_profiler = ParseProfiler(os.getenv('PARSE_PROFILE', '0') == '1',
+                                            float(os.getenv('PARSE_PROFILE_THRESHOLD_MS', '100')),
+                                            os.getenv('PARSE_PROFILE_DIR', os.path.join('cache', 'parse_profiles')),
+                                            int(os.getenv('PARSE_PROFILE_MAX_CAPTURES', '50')))
+        self.lxml_extractor = LxmlEvaluationExtractor(self.clean_seller_name, self.parse_profiler)
+        
+        if init_database:
+            self.setup_database()
+    
+    def resolve_parser_backend(self, backend: str) -> str:
+        """Pick the parser backend, falling back to BeautifulSoup if lxml is not installed"""
+        if backend not in ("lxml", "bs4"):
+            log_event(logging.WARNING, "unknown_parser_backend", backend=backend, using="bs4")
+            return "bs4"
+        if backend == "lxml" and importlib.util.find_spec("lxml") is None:
+            log_event(logging.WARNING, "lxml_unavailable", using="bs4")
+            return "bs4"
+        return backend
         
     def setup_database(self):
-        """Create database table if it doesn't exist"""
+        """Create or update the tables when the database's schema version is behind SCHEMA_VERSION"""
         try:
-            conn = psycopg2.connect(**self.db_config)
-            cur = conn.cursor()
-            
-            # Create table with bid_id as primary key (non-sequential)
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS bid_evaluations (
-                    id VARCHAR(100) PRIMARY KEY,  -- Changed from SERIAL to VARCHAR, will store actual bid ID
-                    bid_number VARCHAR(100) UNIQUE NOT NULL,
-                    items TEXT,
-                    quantity INTEGER,
-                    ministry_name VARCHAR(500),
-                    department_name VARCHAR(500),
-                    start_date TIMESTAMP,
-                    end_date TIMESTAMP,
-                    evaluation JSONB,
-                    parent_evaluation JSONB,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
+            with self.db.connection() as conn:
+                cur = conn.cursor()
                 
-                CREATE INDEX IF NOT EXISTS idx_bid_number ON bid_evaluations(bid_number);
-                CREATE INDEX IF NOT EXISTS idx_ministry ON bid_evaluations(ministry_name);
-                CREATE INDEX IF NOT EXISTS idx_evaluation ON bid_evaluations USING GIN(evaluation);
-                CREATE INDEX IF NOT EXISTS idx_parent_evaluation ON bid_evaluations USING GIN(parent_evaluation);
-            """)
+                table_kind = self.get_bid_table_kind(cur)
+                if table_kind is None and self.db_partitioned:
+                    self.create_partitioned_table(cur)
+                elif table_kind == "r" and self.db_partitioned:
+                    log_event(logging.WARNING, "table_not_partitioned", hint="run migrate-partitions to convert it")
+                
+                # Up to date databases skip the DDL, so quick commands start without it
+                schema_version = self.get_schema_version(cur)
+                if schema_version < SCHEMA_VERSION:
+                    self.create_schema(cur)
+                    log_event(logging.INFO, "schema_updated", from_version=schema_version, to_version=SCHEMA_VERSION)
+                
+                self.partitioned_table = self.get_bid_table_kind(cur) == "p"
+                cur.close()
             
-            conn.commit()
-            cur.close()
-            conn.close()
-            print("Database setup completed successfully")
+            if self.partitioned_table:
+                now = datetime.now()
+                self.ensure_partitions(datetime(now.year + (now.month - 1 + i) // 12, (now.month - 1 + i) % 12 + 1, 1)
+                                       for i in range(self.partition_months_ahead + 1))
+            log_event(logging.DEBUG, "database_setup_completed", schema_version=SCHEMA_VERSION,
+                      partitioned=self.partitioned_table)
             
         except Exception as e:
-            print(f"Database setup error: {e}")
+            log_event(logging.ERROR, "database_setup_failed", error=str(e))
     
-    def fetch_all_bids_paginated(self, start_page: int = 1, end_page: int = 1000):
+    def get_schema_version(self, cur) -> int:
+        """Latest schema version recorded by create_schema, 0 for databases set up before versioning"""
+        cur.execute("SELECT to_regclass('schema_version') IS NOT NULL")
+        if not cur.fetchone()[0]:
+            return 0
+        cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        return cur.fetchone()[0]
+    
+    def create_schema(self, cur):
+        """Create every table and index (all statements are idempotent) and record SCHEMA_VERSION"""
+        # Create table with bid_id as primary key (non-sequential)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS bid_evaluations (
+                id VARCHAR(100) PRIMARY KEY,  -- Changed from SERIAL to VARCHAR, will store actual bid ID
+                bid_number VARCHAR(100) UNIQUE NOT NULL,
+                items TEXT,
+                quantity INTEGER,
+                ministry_name VARCHAR(500),
+                department_name VARCHAR(500),
+                start_date TIMESTAMP,
+                end_date TIMESTAMP,
+                evaluation JSONB,
+                parent_evaluation JSONB,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        self.create_bid_indexes(cur)
+        
+        # Crawl checkpoints: one row per run, its listing progress and the stage of every bid
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_runs (
+                run_id VARCHAR(64) PRIMARY KEY,
+                status VARCHAR(20) NOT NULL,  -- running, interrupted, failed, partial, completed
+                params JSONB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            
+            CREATE TABLE IF NOT EXISTS crawl_listing_state (
+                run_id VARCHAR(64) REFERENCES crawl_runs(run_id) ON DELETE CASCADE,
+                filter_key VARCHAR(64),
+                filters JSONB NOT NULL,
+                last_completed_page INTEGER NOT NULL,  -- every page up to this one is listed
+                last_page INTEGER,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (run_id, filter_key)
+            );
+            
+            CREATE TABLE IF NOT EXISTS crawl_bid_state (
+                run_id VARCHAR(64) REFERENCES crawl_runs(run_id) ON DELETE CASCADE,
+                bid_id VARCHAR(100),
+                stage VARCHAR(10) NOT NULL,  -- listed, fetched, parsed, saved
+                bid_info JSONB,  -- listing data, kept until the bid is saved
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (run_id, bid_id)
+            );
+        """)
+        
+        # Normalized copy of sellers_participated for analytics, rewritten with every bid upsert
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS sellers (
+                id SERIAL PRIMARY KEY,
+                name VARCHAR(500) UNIQUE NOT NULL
+            );
+            
+            CREATE TABLE IF NOT EXISTS bid_participations (
+                bid_id VARCHAR(100) NOT NULL,
+                is_parent BOOLEAN NOT NULL,  -- row comes from the parent bid's evaluation
+                position INTEGER NOT NULL,  -- order in sellers_participated
+                seller_id INTEGER NOT NULL REFERENCES sellers(id),
+                evaluation_type VARCHAR(20),  -- technical, financial, general
+                offered_item TEXT,
+                rank INTEGER,  -- 1 for L1
+                total_price NUMERIC(20, 2),
+                status VARCHAR(100),
+                PRIMARY KEY (bid_id, is_parent, position)
+            );
+            
+            ALTER TABLE bid_participations ADD COLUMN IF NOT EXISTS status_value VARCHAR(20);  -- see SELLER_STATUSES
+            
+            CREATE INDEX IF NOT EXISTS idx_participations_seller ON bid_participations(seller_id, rank);
+            CREATE INDEX IF NOT EXISTS idx_participations_rank_price ON bid_participations(rank, total_price);
+            CREATE INDEX IF NOT EXISTS idx_participations_type ON bid_participations(evaluation_type);
+            CREATE INDEX IF NOT EXISTS idx_participations_status_value ON bid_participations(status_value);
+        """)
+        
+        # Parent evaluations shared by child bids (PARENT_CACHE_PERSIST)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS parent_evaluations (
+                parent_id VARCHAR(100) PRIMARY KEY,
+                evaluation JSONB NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        
+        # Applied schema versions (see get_schema_version)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            
+            INSERT INTO schema_version (version) VALUES (%s) ON CONFLICT (version) DO NOTHING;
+        """, (SCHEMA_VERSION,))
+    
+    def create_http_session(self) -> requests.Session:
+        """requests session with a keep-alive pool sized to the concurrency (send_request does the retries)"""
+        from requests.adapters import HTTPAdapter
+        
+        adapter = HTTPAdapter(pool_maxsize=self.concurrency + self.listing_concurrency)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def get_http_session(self) -> requests.Session:
+        """The shared requests session, created on first use"""
+        if self.session is None:
+            self.session = self.create_http_session()
+        return self.session
+    
+    def retry_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number attempt + 1"""
+        return random.uniform(0, min(self.retry_backoff_max, self.retry_backoff * 2 ** attempt))
+    
+    def get_bid_table_kind(self, cur) -> Optional[str]:
+        """pg_class.relkind of bid_evaluations: 'r' plain table, 'p' partitioned, None if missing"""
+        cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('bid_evaluations')")
+        row = cur.fetchone()
+        return row[0] if row else None
+    
+    def create_partitioned_table(self, cur):
         """
-        Fetch all bids data from the API with pagination
+        bid_evaluations partitioned by month of end_date. Unique keys must contain the partition
+        key, so bids without an end date are stored with '-infinity' in the default partition
         """
-        if not self.cookie_value or not self.csrf_token:
-            print("ERROR: cookie_value and csrf_token must be set!")
-            print("Please update the hardcoded values in the __init__ method")
-            return []
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS bid_evaluations (
+                id VARCHAR(100) NOT NULL,
+                bid_number VARCHAR(100) NOT NULL,
+                items TEXT,
+                quantity INTEGER,
+                ministry_name VARCHAR(500),
+                department_name VARCHAR(500),
+                start_date TIMESTAMP,
+                end_date TIMESTAMP NOT NULL,
+                evaluation JSONB,
+                parent_evaluation JSONB,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (id, end_date),
+                UNIQUE (bid_number, end_date)
+            ) PARTITION BY RANGE (end_date);
+            
+            CREATE TABLE IF NOT EXISTS bid_evaluations_default PARTITION OF bid_evaluations DEFAULT;
+        """)
+        # Also run here: after migrate-partitions the schema version is current and create_schema is skipped
+        self.create_bid_indexes(cur)
+        log_event(logging.INFO, "partitioned_table_created", table="bid_evaluations")
+    
+    def create_bid_indexes(self, cur):
+        """Secondary indexes of bid_evaluations, for either layout (idempotent)"""
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_bid_number ON bid_evaluations(bid_number);
+            CREATE INDEX IF NOT EXISTS idx_ministry ON bid_evaluations(ministry_name);
+            CREATE INDEX IF NOT EXISTS idx_evaluation ON bid_evaluations USING GIN(evaluation);
+            CREATE INDEX IF NOT EXISTS idx_parent_evaluation ON bid_evaluations USING GIN(parent_evaluation);
+        """)
+    
+    def ensure_partitions(self, end_dates):
+        """Create the monthly partitions the given end dates fall into, if the table is partitioned"""
+        if not self.partitioned_table:
+            return
         
-        url = f"{self.base_url}/all-bids-data"
+        # Neighbouring days too: Postgres converts aware datetimes in its own time zone
+        months = set()
+        for end_date in end_dates:
+            if isinstance(end_date, datetime):
+                for day in (end_date - timedelta(days=1), end_date, end_date + timedelta(days=1)):
+                    months.add(datetime(day.year, day.month, 1))
+        missing = sorted(months - self.known_partitions)
+        if not missing:
+            return
+        
+        def create(conn):
+            with conn.cursor() as cur:
+                for month in missing:
+                    next_month = datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+                    cur.execute(f"""
+                        CREATE TABLE IF NOT EXISTS bid_evaluations_y{month.year:04d}m{month.month:02d}
+                        PARTITION OF bid_evaluations FOR VALUES FROM (%s) TO (%s)
+                    """, (month, next_month))
         
-        headers = {
+        self.db.run(create)
+        self.known_partitions.update(missing)
+    
+    def migrate_to_partitioned(self) -> bool:
+        """
+        Convert a plain bid_evaluations table to the partitioned layout, copying month by month.
+        The old table is kept as bid_evaluations_unpartitioned until it is dropped by hand, and
+        running this again continues an interrupted migration. Stop crawls while it runs
+        """
+        def rename_old(conn):
+            with conn.cursor() as cur:
+                table_kind = self.get_bid_table_kind(cur)
+                cur.execute("SELECT to_regclass('bid_evaluations_unpartitioned') IS NOT NULL")
+                old_exists = cur.fetchone()[0]
+                if table_kind == "p":
+                    return old_exists
+                if table_kind != "r" or old_exists:
+                    return False
+                
+                cur.execute("ALTER TABLE bid_evaluations RENAME TO bid_evaluations_unpartitioned")
+                # Index names are schema-wide, free them for the new table
+                cur.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'bid_evaluations_unpartitioned'")
+                for (index_name,) in cur.fetchall():
+                    cur.execute(f'ALTER INDEX "{index_name}" RENAME TO "{(index_name + "_unpartitioned")[:63]}"')
+                return True
+        
+        if not self.db.run(rename_old):
+            print("Nothing to migrate: bid_evaluations is already partitioned or does not exist")
+            return False
+        
+        self.db_partitioned = True
+        self.setup_database()
+        if not self.partitioned_table:
+            print("Could not create the partitioned bid_evaluations table")
+            return False
+        
+        def load_months(conn):
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT DISTINCT date_trunc('month', end_date) FROM bid_evaluations_unpartitioned
+                    WHERE end_date IS NOT NULL ORDER BY 1
+                """)
+                return [row[0] for row in cur]
+        
+        def copy_range(conn, start, end) -> int:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO bid_evaluations
+                    (id, bid_number, items, quantity, ministry_name, department_name, start_date, end_date,
+                     evaluation, parent_evaluation, created_at, updated_at)
+                    SELECT id, bid_number, items, quantity, ministry_name, department_name, start_date,
+                           COALESCE(end_date, '-infinity'), evaluation, parent_evaluation, created_at, updated_at
+                    FROM bid_evaluations_unpartitioned
+                    WHERE (%(start)s::timestamp IS NULL AND end_date IS NULL)
+                       OR (end_date >= %(start)s AND end_date < %(end)s)
+                    ON CONFLICT DO NOTHING
+                """, {"start": start, "end": end})
+                return cur.rowcount
+        
+        months = self.db.run(load_months)
+        self.ensure_partitions(months)
+        copied = self.db.run(lambda conn: copy_range(conn, None, None))
+        for month in months:
+            next_month = datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+            copied += self.db.run(lambda conn: copy_range(conn, month, next_month))
+            print(f"  ✓ Copied {month:%Y-%m} ({copied} rows so far)")
+        
+        def count(conn):
+            with conn.cursor() as cur:
+                cur.execute("SELECT (SELECT COUNT(*) FROM bid_evaluations), (SELECT COUNT(*) FROM bid_evaluations_unpartitioned)")
+                return cur.fetchone()
+        
+        new_count, old_count = self.db.run(count)
+        print(f"Migration complete: {new_count} rows in the partitioned table, {old_count} in the old one")
+        if new_count == old_count:
+            print("Check the data, then drop the old table with: DROP TABLE bid_evaluations_unpartitioned")
+        return new_count == old_count
+    
+    def get_listing_headers(self) -> Dict[str, str]:
+        """Headers used for /all-bids-data requests"""
+        return {
             "Accept": "application/json, text/javascript, */*; q=0.01",
+            "Accept-Encoding": ACCEPT_ENCODING,
             "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
             "Cookie": self.cookie_value,
             "Origin": "https://bidplus.gem.gov.in",
@@ -101,36 +2166,39 @@ class GeMBidScraper:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36 Edg/138.0.0.0",
             "X-Requested-With": "XMLHttpRequest"
         }
+    
+    def build_listing_payload(self, page: int, listing_filter: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """Form payload for one /all-bids-data page (with the crawl's filter unless one is given)"""
+        listing_filter = dict(listing_filter or self.listing_filter)
+        param = {key: listing_filter.pop(key, default) for key, default in LISTING_PARAM_KEYS.items()}
+        return {
+            "payload": json.dumps({
+                "page": page,
+                "param": param,
+                "filter": listing_filter
+            }),
+            "csrf_bd_gem_nk": self.csrf_token
+        }
+    
+    def fetch_all_bids_paginated(self, start_page: int = 1, end_page: int = 1000):
+        """
+        Fetch all bids data from the API with pagination
+        """
+        if not self.cookie_value or not self.csrf_token:
+            log_event(logging.ERROR, "missing_credentials", hint="set GEM_COOKIE and CSRF_TOKEN")
+            return []
+        
+        url = f"{self.base_url}/all-bids-data"
+        headers = self.listing_headers
         
         all_docs = []
         
         for page in range(start_page, end_page + 1):
-            print(f"Fetching page {page}/{end_page}...")
-            
-            payload = {
-                "payload": json.dumps({
-                    "page": page,
-                    "param": {
-                        "searchBid": "",
-                        "searchType": "fullText"
-                    },
-                    "filter": {
-                        "bidStatusType": "bidrastatus",
-                        "byType": "all",
-                        "highBidValue": "",
-                        "byEndDate": {
-                            "from": "2025-01-01",
-                            "to": "2025-03-01"
-                        },
-                        "sort": "Bid-End-Date-Latest",
-                        "byStatus": "bid_awarded"
-                    }
-                }),
-                "csrf_bd_gem_nk": self.csrf_token
-            }
+            payload = self.build_listing_payload(page)
             
             try:
-                response = self.session.post(url, headers=headers, data=payload)
+                # The search only reads, so it is retried like the result view GETs
+                response = self.send_request("POST", url, idempotent=True, headers=headers, data=payload)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -140,30 +2208,207 @@ class GeMBidScraper:
                     docs = data['response']['response']['docs']
                     num_found = data['response']['response']['numFound']
                     
-                    print(f"Page {page}: Found {len(docs)} bids (Total in system: {num_found})")
+                    log_event(logging.DEBUG, "listing_page", page=page, bids=len(docs), num_found=num_found)
                     
                     if len(docs) == 0:
-                        print(f"No more bids found on page {page}. Stopping pagination.")
+                        log_event(logging.INFO, "listing_empty", page=page)
                         break
                     
                     all_docs.extend(docs)
                     
-                    # Add delay between requests to avoid overwhelming the server
-                    time.sleep(0.5)
-                    
                 else:
-                    print(f"Page {page}: No bids found or unexpected response structure")
+                    log_event(logging.WARNING, "listing_page_empty", page=page)
                     # Continue to next page instead of breaking, might be temporary issue
                     
             except requests.exceptions.RequestException as e:
-                print(f"Error fetching page {page}: {e}")
-                # Continue to next page instead of breaking
-                time.sleep(2)  # Longer delay on error
+                log_event(logging.ERROR, "listing_page_failed", page=page, error=str(e))
+                # Continue to next page instead of breaking, the rate limiter has already backed off
+                continue
+        
+        log_event(logging.INFO, "listing_finished", bids=len(all_docs))
+        return all_docs
+    
+    async def fetch_listing_page_async(self, http: aiohttp.ClientSession, page: int,
+                                       listing_filter: Optional[Dict[str, Any]] = None,
+                                       label: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch one listing page, returns the inner response (docs, numFound) or None on error.
+        label names the slice in log events, e.g. the end date window being listed
+        """
+        url = f"{self.base_url}/all-bids-data"
+        
+        try:
+            # The search only reads, so it is retried like the result view GETs
+            body = await self.request_text_async(http, "POST", url, idempotent=True, headers=self.listing_headers,
+                                                 data=self.build_listing_payload(page, listing_filter))
+            data = json.loads(body)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            log_event(logging.ERROR, "listing_page_failed", slice=label, page=page, error=str(e))
+            return None
+        
+        if data.get('status') == 1 and data.get('response', {}).get('response', {}).get('docs'):
+            result = data['response']['response']
+            log_event(logging.DEBUG, "listing_page", slice=label, page=page, bids=len(result["docs"]),
+                      num_found=result.get("numFound"))
+            return result
+        
+        log_event(logging.WARNING, "listing_page_empty", slice=label, page=page)
+        return {"docs": [], "numFound": 0}
+    
+    def plan_last_page(self, start_page: int, end_page: int, num_found: int, page_size: int) -> int:
+        """Work out the real last page from numFound and the page size"""
+        if page_size <= 0:
+            return start_page
+        return max(start_page, min(end_page, math.ceil(num_found / page_size)))
+    
+    def get_bid_id(self, bid: Dict[str, Any]) -> Any:
+        """Bid id from a listing doc (the API wraps most values in lists)"""
+        bid_id = bid.get("id")
+        if isinstance(bid_id, list):
+            return bid_id[0] if bid_id else None
+        return bid_id
+    
+    async def fetch_all_bids_concurrent_async(self, start_page: int, end_page: int, concurrency: int) -> List[Dict[str, Any]]:
+        """Read numFound from the first page, then fetch the remaining pages in parallel"""
+        async with self.create_async_session(concurrency) as http:
+            first_page = await self.fetch_listing_page_async(http, start_page)
+            if not first_page or not first_page["docs"]:
+                log_event(logging.INFO, "listing_empty", page=start_page)
+                return []
+            
+            num_found = int(first_page.get("numFound") or 0)
+            page_size = len(first_page["docs"])
+            last_page = self.plan_last_page(start_page, end_page, num_found, page_size)
+            log_event(logging.INFO, "listing_planned", num_found=num_found, page_size=page_size,
+                      first_page=start_page, last_page=last_page)
+            
+            semaphore = asyncio.Semaphore(concurrency)
+            
+            async def fetch_page(page: int) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    return await self.fetch_listing_page_async(http, page)
+            
+            pages = list(range(start_page + 1, last_page + 1))
+            results = await asyncio.gather(*(fetch_page(page) for page in pages))
+        
+        # Keep page order and drop bids repeated across pages (the listing shifts while we read it)
+        all_docs = []
+        seen_ids = set()
+        failed_pages = []
+        for page, result in zip([start_page] + pages, [first_page] + results):
+            if result is None:
+                failed_pages.append(page)
                 continue
+            
+            for doc in result["docs"]:
+                bid_id = self.get_bid_id(doc)
+                if bid_id is not None:
+                    if bid_id in seen_ids:
+                        continue
+                    seen_ids.add(bid_id)
+                all_docs.append(doc)
         
-        print(f"Total bids fetched across all pages: {len(all_docs)}")
+        if failed_pages:
+            log_event(logging.ERROR, "listing_pages_failed", pages=failed_pages)
+        log_event(logging.INFO, "listing_finished", bids=len(all_docs))
         return all_docs
     
+    def fetch_all_bids_concurrent(self, start_page: int = 1, end_page: int = 1000, concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch listing pages in parallel, stopping at the last page implied by numFound.
+        Returns docs in page order, de-duplicated by bid id
+        """
+        if not self.cookie_value or not self.csrf_token:
+            log_event(logging.ERROR, "missing_credentials", hint="set GEM_COOKIE and CSRF_TOKEN")
+            return []
+        
+        return asyncio.run(self.fetch_all_bids_concurrent_async(start_page, end_page, concurrency or self.concurrency))
+    
+    def send_request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        """
+        Send a request through the shared rate limiter. Idempotent requests (GETs unless told
+        otherwise) are retried like request_async, every attempt is reported to the rate limiter
+        """
+        family = self.rate_limiter.family_for_url(url)
+        if idempotent is None:
+            idempotent = method == "GET"
+        retries = self.request_retries if idempotent else 0
+        kwargs.setdefault("timeout", (self.connect_timeout, self.read_timeout))
+        
+        for attempt in range(retries + 1):
+            if attempt:
+                self.metrics.inc("gem_http_retries_total", endpoint=family)
+            self.rate_limiter.acquire(family)
+            started = time.monotonic()
+            try:
+                response = self.get_http_session().request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.rate_limiter.record(family, None, time.monotonic() - started, sent_at=started)
+                self.metrics.inc("gem_http_requests_total", endpoint=family, status="error")
+                if attempt == retries:
+                    raise
+                time.sleep(self.retry_delay(attempt))
+                continue
+            except requests.exceptions.RequestException:
+                self.rate_limiter.record(family, None, time.monotonic() - started, sent_at=started)
+                self.metrics.inc("gem_http_requests_total", endpoint=family, status="error")
+                raise
+            
+            elapsed = time.monotonic() - started
+            self.rate_limiter.record(family, response.status_code, elapsed, response.headers.get("Retry-After"),
+                                     sent_at=started)
+            self.metrics.inc("gem_http_requests_total", endpoint=family, status=str(response.status_code))
+            self.metrics.observe("gem_http_request_seconds", elapsed, endpoint=family)
+            self.metrics.inc("gem_http_body_bytes_total", len(response.content), endpoint=family)
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+            
+            time.sleep(self.retry_delay(attempt))
+    
+    async def request_text_async(self, http: aiohttp.ClientSession, method: str, url: str,
+                                 idempotent: Optional[bool] = None, **kwargs) -> str:
+        """Send an aiohttp request through the shared rate limiter and return the body"""
+        _, body, _ = await self.request_async(http, method, url, idempotent, **kwargs)
+        return body
+    
+    async def request_async(self, http: aiohttp.ClientSession, method: str, url: str,
+                            idempotent: Optional[bool] = None, **kwargs) -> Tuple[int, str, Any]:
+        """
+        Send an aiohttp request through the shared rate limiter, returns (status, body, headers).
+        Idempotent requests (GETs unless told otherwise) are retried after connection errors,
+        timeouts and RETRY_STATUSES with jittered backoff
+        """
+        family = self.rate_limiter.family_for_url(url)
+        if idempotent is None:
+            idempotent = method == "GET"
+        retries = self.request_retries if idempotent else 0
+        
+        for attempt in range(retries + 1):
+            if attempt:
+                self.metrics.inc("gem_http_retries_total", endpoint=family)
+            await self.rate_limiter.acquire_async(family)
+            started = time.monotonic()
+            try:
+                async with http.request(method, url, **kwargs) as response:
+                    body = await response.text(errors="replace")
+                    elapsed = time.monotonic() - started
+                    self.rate_limiter.record(family, response.status, elapsed, response.headers.get("Retry-After"),
+                                             sent_at=started)
+                    self.metrics.inc("gem_http_requests_total", endpoint=family, status=str(response.status))
+                    self.metrics.observe("gem_http_request_seconds", elapsed, endpoint=family)
+                    self.metrics.inc("gem_http_body_bytes_total", response.content.total_bytes, endpoint=family)
+                    if response.status not in RETRY_STATUSES or attempt == retries:
+                        response.raise_for_status()
+                        return response.status, body, response.headers
+                    
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self.rate_limiter.record(family, None, time.monotonic() - started, sent_at=started)
+                self.metrics.inc("gem_http_requests_total", endpoint=family, status="error")
+                if attempt == retries:
+                    raise
+            
+            await asyncio.sleep(self.retry_delay(attempt))
+    
     def extract_bid_info(self, bid: Dict[str, Any]) -> Dict[str, Any]:
         """
         Extract required information from a bid based on actual API response structure
@@ -186,99 +2431,325 @@ class GeMBidScraper:
             "ba_official_details_deptName": get_value(bid.get("ba_official_details_deptName"))
         }
         
-        # Check if parent bid exists - look for b_id_parent or b_bid_number_parent
-        b_id_parent = get_value(bid.get("b_id_parent"))
-        b_bid_number_parent = get_value(bid.get("b_bid_number_parent"))
+        # Check if parent bid exists - look for b_id_parent or b_bid_number_parent
+        b_id_parent = get_value(bid.get("b_id_parent"))
+        b_bid_number_parent = get_value(bid.get("b_bid_number_parent"))
+        
+        if b_id_parent or b_bid_number_parent:
+            bid_info.update({
+                "b_bid_number_parent": b_bid_number_parent,
+                "b_id_parent": b_id_parent,
+                "b_cat_id": get_value(bid.get("b_cat_id"))
+            })
+        
+        # Add additional fields that might be useful
+        bid_info["b_cat_id"] = get_value(bid.get("b_cat_id"))
+        bid_info["b_eval_type"] = get_value(bid.get("b_eval_type"))
+        bid_info["bbt_title"] = get_value(bid.get("bbt_title"))
+        
+        return bid_info
+    
+    def get_result_view_url(self, bid_id: str, is_parent: bool = False) -> str:
+        """Build the result view URL (single packet view for parent bids)"""
+        if is_parent:
+            return f"{self.base_url}/bidding/bid/getSinglePacketResultView/{bid_id}"
+        return f"{self.base_url}/bidding/bid/getBidResultView/{bid_id}"
+    
+    def get_result_view_headers(self, bid_id: str) -> Dict[str, str]:
+        """Headers used for result view requests"""
+        headers = dict(self.result_view_headers)
+        headers["Referer"] = f"https://bidplus.gem.gov.in/bidding/bid/show/{bid_id}"
+        return headers
+    
+    def get_result_view_endpoint(self, is_parent: bool = False) -> str:
+        """Endpoint name used as part of the result view cache key"""
+        return "getSinglePacketResultView" if is_parent else "getBidResultView"
+    
+    def get_result_cache(self) -> Optional[ResultViewCache]:
+        """Open the raw result view cache on first use, None when it is disabled or unusable"""
+        if self.result_cache is None and self.result_cache_path:
+            try:
+                self.result_cache = ResultViewCache(self.result_cache_path, self.result_cache_max_bytes,
+                                                    self.result_cache_ttl)
+            except (sqlite3.Error, OSError) as e:
+                log_event(logging.WARNING, "result_cache_unavailable", path=self.result_cache_path, error=str(e))
+                self.result_cache_path = ""
+        return self.result_cache
+    
+    def use_result_cache(self, operation, *args):
+        """
+        Run a result cache operation, returns its result. The cache only saves requests: when it fails
+        (disk full, locked database) the error is logged once and the run continues without it
+        """
+        try:
+            return operation(*args)
+        except (sqlite3.Error, OSError) as e:
+            with self.result_cache_lock:
+                if self.result_cache is not None:
+                    self.result_cache = None
+                    log_event(logging.WARNING, "result_cache_error", path=self.result_cache_path, error=str(e),
+                              using="no_cache")
+                    self.result_cache_path = ""
+            return None
+    
+    def get_bid_result_view(self, bid_id: str, is_parent: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get detailed bid result view with enhanced evaluation extraction
+        """
+        url = self.get_result_view_url(bid_id, is_parent)
+        headers = self.get_result_view_headers(bid_id)
+        endpoint = self.get_result_view_endpoint(is_parent)
+        cache = self.get_result_cache()
+        cached = self.use_result_cache(cache.get, endpoint, bid_id) if cache else None
+        if cached and cached["fresh"]:
+            return self.parse_result_view_html(cached["body"], bid_id)
+        if cached:
+            headers.update(cache.validators(cached))
+        
+        try:
+            response = self.send_request("GET", url, headers=headers)
+            response.raise_for_status()
+            
+            if response.status_code == 304 and cached:
+                self.use_result_cache(cache.revalidated, endpoint, bid_id)
+                return self.parse_result_view_html(cached["body"], bid_id)
+            if cache:
+                self.use_result_cache(cache.put, endpoint, bid_id, response.text, response.headers.get("ETag"),
+                                      response.headers.get("Last-Modified"))
+            
+            return self.parse_result_view_html(response.text, bid_id)
+            
+        except requests.exceptions.RequestException as e:
+            log_event(logging.ERROR, "result_view_failed", bid_id=bid_id, endpoint=endpoint, error=str(e))
+            return None
+    
+    async def get_bid_result_view_async(self, http: aiohttp.ClientSession, bid_id: str, is_parent: bool = False) -> Optional[Dict[str, Any]]:
+        """Async variant of get_bid_result_view sharing one aiohttp session"""
+        html_content = await self.fetch_result_view_html_async(http, bid_id, is_parent)
+        if html_content is None:
+            return None
+        
+        return await self.parse_result_view_async(html_content, bid_id)
+    
+    async def fetch_result_view_html_async(self, http: aiohttp.ClientSession, bid_id: str, is_parent: bool = False) -> Optional[str]:
+        """
+        Result view page through the raw response cache: fresh entries skip the request,
+        stale ones are revalidated. None if the request fails and nothing is cached
+        """
+        url = self.get_result_view_url(bid_id, is_parent)
+        headers = self.get_result_view_headers(bid_id)
+        endpoint = self.get_result_view_endpoint(is_parent)
+        cache = self.get_result_cache()
+        started = time.perf_counter()
+        
+        def done(source: str, body: Optional[str]) -> Optional[str]:
+            self.metrics.observe("gem_result_view_seconds", time.perf_counter() - started,
+                                 endpoint=endpoint, source=source)
+            return body
+        
+        # SQLite and zlib block, keep them off the event loop
+        cached = await asyncio.to_thread(self.use_result_cache, cache.get, endpoint, bid_id) if cache else None
+        if cached and cached["fresh"]:
+            return done("cache", cached["body"])
+        if cached:
+            headers.update(cache.validators(cached))
+        
+        try:
+            status, body, response_headers = await self.request_async(http, "GET", url, headers=headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if cached:
+                log_event(logging.WARNING, "result_view_failed", bid_id=bid_id, endpoint=endpoint, error=str(e),
+                          using="stale_cache")
+                return done("stale_cache", cached["body"])
+            log_event(logging.ERROR, "result_view_failed", bid_id=bid_id, endpoint=endpoint, error=str(e))
+            return done("error", None)
+        
+        if status == 304 and cached:
+            await asyncio.to_thread(self.use_result_cache, cache.revalidated, endpoint, bid_id)
+            return done("revalidated", cached["body"])
+        if cache:
+            await asyncio.to_thread(self.use_result_cache, cache.put, endpoint, bid_id, body,
+                                    response_headers.get("ETag"), response_headers.get("Last-Modified"))
+        return done("network", body)
+    
+    @contextmanager
+    def parse_workers(self):
+        """Parse result views in a process pool for the duration of the block"""
+        if self.parse_worker_count <= 0 or self.parse_executor is not None:
+            yield
+            return
+        
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # spawn: the crawl process already runs threads (DB writes), forking it is not safe
+        self.parse_executor = ProcessPoolExecutor(
+            max_workers=self.parse_worker_count,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_parse_worker,
+            initargs=(self.parser_backend, self.parse_profiler.settings())
+        )
+        try:
+            yield
+        finally:
+            self.parse_executor.shutdown(wait=True, cancel_futures=True)
+            self.parse_executor = None
+    
+    @contextmanager
+    def parent_evaluations(self):
+        """Share one parent evaluation cache across all bids enriched in the block"""
+        if self.parent_cache is not None:
+            yield
+            return
+        
+        self.parent_cache = ParentEvaluationCache(self, self.parent_cache_persist, self.parent_cache_ttl)
+        try:
+            yield
+        finally:
+            log_event(logging.INFO, "parent_evaluations", summary=self.parent_cache.describe())
+            self.parent_cache = None
+    
+    async def get_parent_result_view_async(self, http: aiohttp.ClientSession, parent_id: str) -> Optional[Dict[str, Any]]:
+        """Parent result view through the run's parent cache when one is active"""
+        if self.parent_cache is None:
+            return await self.get_bid_result_view_async(http, parent_id, is_parent=True)
+        return await self.parent_cache.get(http, parent_id)
+    
+    async def parse_result_view_async(self, html_content: str, bid_id: str) -> Dict[str, Any]:
+        """Parse in a worker process so the event loop keeps fetching, inline if no pool is running"""
+        if self.parse_executor is None:
+            return self.parse_result_view_html(html_content, bid_id)
         
-        if b_id_parent or b_bid_number_parent:
-            bid_info.update({
-                "b_bid_number_parent": b_bid_number_parent,
-                "b_id_parent": b_id_parent,
-                "b_cat_id": get_value(bid.get("b_cat_id"))
-            })
+        loop = asyncio.get_running_loop()
+        try:
+            evaluation, metrics = await loop.run_in_executor(self.parse_executor, parse_result_view_in_worker,
+                                                             html_content, bid_id)
+            self.metrics.merge(metrics)
+            return evaluation
+        except Exception as e:
+            # Broken or shut down pool, pickling error or an error raised in the worker: a bid
+            # must not be saved without its evaluation because the pool failed, parse it here
+            log_event(logging.WARNING, "parse_worker_failed", bid_id=bid_id, error=f"{type(e).__name__}: {e}",
+                      using="inline")
+            return self.parse_result_view_html(html_content, bid_id)
+    
+    def parse_result_view_html(self, html_content: str, bid_id: str, parser_backend: Optional[str] = None) -> Dict[str, Any]:
+        """Parse result view HTML into evaluation data with the configured parser backend"""
+        backend = parser_backend or self.parser_backend
+        started = time.perf_counter()
         
-        # Add additional fields that might be useful
-        bid_info["b_cat_id"] = get_value(bid.get("b_cat_id"))
-        bid_info["b_eval_type"] = get_value(bid.get("b_eval_type"))
-        bid_info["bbt_title"] = get_value(bid.get("bbt_title"))
+        with self.parse_profiler.page() as timings:
+            evaluation_data = self.extract_evaluation_data(html_content, bid_id, backend)
         
-        return bid_info
+        seconds = time.perf_counter() - started
+        self.metrics.observe("gem_parse_seconds", seconds, backend=backend)
+        if self.parse_profiler.enabled:
+            for phase, phase_seconds in timings.items():
+                self.metrics.observe("gem_parse_phase_seconds", phase_seconds, backend=backend, phase=phase)
+            if seconds * 1000 >= self.parse_profiler.threshold_ms:
+                self.capture_slow_page(html_content, bid_id, backend, seconds, timings, evaluation_data)
+        return evaluation_data
     
-    def get_bid_result_view(self, bid_id: str, is_parent: bool = False) -> Optional[Dict[str, Any]]:
+    def extract_evaluation_data(self, html_content: str, bid_id: str, backend: str, observe: bool = True) -> Dict[str, Any]:
         """
-        Get detailed bid result view with enhanced evaluation extraction
+        Evaluation data of a result view page, with each extraction path timed for the parse profiler.
+        observe=False leaves logs and metrics alone, for the profiler's second parse of a slow page
         """
-        if is_parent:
-            url = f"{self.base_url}/bidding/bid/getSinglePacketResultView/{bid_id}"
-        else:
-            url = f"{self.base_url}/bidding/bid/getBidResultView/{bid_id}"
-        
-        headers = {
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
-            "Cookie": self.cookie_value,
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36 Edg/138.0.0.0",
-            "Referer": f"https://bidplus.gem.gov.in/bidding/bid/show/{bid_id}"
+        evaluation_data: Dict[str, Any] = {
+            "has_financial_evaluation": False,
+            "has_technical_evaluation": False,
+            "has_general_evaluation": False,
+            "sellers_participated": []
         }
+        phase = self.parse_profiler.phase
         
+        # Extract sellers participation data using lxml or BeautifulSoup
         try:
-            response = self.session.get(url, headers=headers)
-            response.raise_for_status()
-            
-            # Parse the HTML response to extract evaluation data
-            html_content = response.text
-            
-            evaluation_data: Dict[str, Any] = {
-                "has_financial_evaluation": False,
-                "has_technical_evaluation": False,
-                "has_general_evaluation": False,
-                "sellers_participated": []
-            }
-            
-            # Extract sellers participation data using BeautifulSoup if available
-            try:
+            if backend == "lxml":
+                with phase("document"):
+                    root = self.lxml_extractor.parse(html_content)
+                evaluation_data = self.lxml_extractor.extract_all_evaluations(root, evaluation_data)
+            else:
                 from bs4 import BeautifulSoup
-                soup = BeautifulSoup(html_content, 'html.parser')
+                with phase("document"):
+                    soup = BeautifulSoup(html_content, 'html.parser')
                 
                 # Enhanced extraction method - look for all evaluation sections
                 evaluation_data = self.extract_all_evaluations(soup, evaluation_data)
-                
-                # Also try to extract parent bid ID from the HTML if present
+            
+            # Also try to extract parent bid ID from the HTML if present
+            with phase("parent_id"):
                 parent_bid_id = self.extract_parent_bid_id_from_html(html_content)
-                if parent_bid_id:
-                    evaluation_data["parent_bid_id_found"] = parent_bid_id
-                
-            except ImportError:
-                print("  BeautifulSoup not available - using basic string matching")
-                # Enhanced fallback method using regex
-                evaluation_data = self.extract_evaluations_with_regex(html_content, evaluation_data)
-                
-            except Exception as e:
-                print(f"  Error parsing HTML for bid {bid_id}: {e}")
-                # Try regex fallback
-                evaluation_data = self.extract_evaluations_with_regex(html_content, evaluation_data)
+            if parent_bid_id:
+                evaluation_data["parent_bid_id_found"] = parent_bid_id
             
-            return evaluation_data
+        except ImportError:
+            if observe:
+                log_event(logging.WARNING, "regex_fallback", bid_id=bid_id, reason="BeautifulSoup not available")
+            # Enhanced fallback method using regex
+            evaluation_data = self.regex_fallback(html_content, evaluation_data, "no_parser", observe)
             
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching bid result view for ID {bid_id}: {e}")
-            return None
+        except Exception as e:
+            if observe:
+                log_event(logging.ERROR, "parse_failed", bid_id=bid_id, error=str(e), using="regex")
+            # Try regex fallback
+            evaluation_data = self.regex_fallback(html_content, evaluation_data, "parse_error", observe)
+        
+        # Typed price, rank and status so consumers never re-parse the text
+        with phase("typed_fields"):
+            for key in ("sellers_participated", "technical_evaluation", "financial_evaluation", "general_evaluation"):
+                for seller in evaluation_data.get(key) or []:
+                    add_typed_seller_fields(seller)
+        
+        return evaluation_data
+    
+    def regex_fallback(self, html_content: str, evaluation_data: Dict[str, Any], reason: str,
+                       observe: bool = True) -> Dict[str, Any]:
+        """extract_evaluations_with_regex, counted and timed as a fallback"""
+        started = time.perf_counter()
+        with self.parse_profiler.phase("regex_fallback"):
+            evaluation_data = self.extract_evaluations_with_regex(html_content, evaluation_data)
+        if observe:
+            self.metrics.inc("gem_regex_fallback_total", reason=reason)
+            self.metrics.observe("gem_regex_fallback_seconds", time.perf_counter() - started)
+        return evaluation_data
+    
+    def capture_slow_page(self, html_content: str, bid_id: str, backend: str, seconds: float,
+                          timings: Dict[str, float], evaluation_data: Dict[str, Any]):
+        """Save a page slower than the profiling threshold with a cProfile of parsing it again"""
+        try:
+            prefix = self.parse_profiler.capture(
+                html_content, bid_id, backend, seconds, timings,
+                len(evaluation_data.get("sellers_participated") or []),
+                lambda: self.extract_evaluation_data(html_content, bid_id, backend, observe=False))
+        except OSError as e:
+            log_event(logging.WARNING, "parse_capture_failed", bid_id=bid_id, error=str(e))
+            return
+        if prefix:
+            self.metrics.inc("gem_parse_captures_total", backend=backend)
+            log_event(logging.INFO, "slow_parse_captured", bid_id=bid_id, backend=backend,
+                      ms=round(seconds * 1000, 1), phases={phase: round(value * 1000, 2) for phase, value in timings.items()},
+                      path=prefix)
+    
+    def has_any_evaluation(self, evaluation_data: Optional[Dict[str, Any]]) -> bool:
+        """Check whether a result view contains any evaluation section"""
+        if not evaluation_data:
+            return False
+        return (evaluation_data.get("has_financial_evaluation", False) or 
+                evaluation_data.get("has_technical_evaluation", False) or 
+                evaluation_data.get("has_general_evaluation", False))
     
     def extract_parent_bid_id_from_html(self, html_content: str) -> Optional[str]:
         """Extract parent bid ID from HTML content"""
-        # Look for parent bid patterns in the HTML
-        parent_patterns = [
-            r'Parent\s*Bid\s*ID[:\s]*(\d+)',
-            r'parent[_\s]*bid[_\s]*id[:\s]*(\d+)',
-            r'getSinglePacketResultView/(\d+)',
-            r'b_id_parent[:\s]*(\d+)'
-        ]
-        
-        for pattern in parent_patterns:
-            match = re.search(pattern, html_content, re.IGNORECASE)
-            if match:
-                return match.group(1)
+        # One pass over the HTML; the highest priority pattern wins, as if each were searched in turn
+        best_match = None
+        for match in PARENT_BID_ID_RE.finditer(html_content):
+            if best_match is None or match.lastindex < best_match.lastindex:
+                best_match = match
+                if match.lastindex == 1:
+                    break
         
-        return None
+        return best_match.group(best_match.lastindex) if best_match else None
     
     def extract_all_evaluations(self, soup, evaluation_data: Dict[str, Any]) -> Dict[str, Any]:
         """Enhanced evaluation extraction using BeautifulSoup"""
@@ -286,44 +2757,46 @@ class GeMBidScraper:
         # Track all sellers across all evaluation types
         all_sellers = []
         
-        # Find all panel headings to identify evaluation types
-        panel_headings = soup.find_all('div', class_='panel-heading')
-        
-        for heading in panel_headings:
-            heading_text = heading.get_text().strip()
-            print(f"    Found panel heading: {heading_text}")
+        with self.parse_profiler.phase("panels"):
+            # Find all panel headings to identify evaluation types
+            panel_headings = soup.find_all('div', class_='panel-heading')
             
-            # Check for different evaluation types with more patterns
-            if any(term in heading_text.upper() for term in ['TECHNICAL', 'TECH EVAL', 'TECHNICAL EVALUATION']):
-                evaluation_data["has_technical_evaluation"] = True
-                technical_sellers = self.extract_technical_evaluation(soup, heading)
-                all_sellers.extend(technical_sellers)
-                print(f"    Extracted {len(technical_sellers)} technical evaluations")
+            for heading in panel_headings:
+                heading_text = heading.get_text().strip()
+                log_event(logging.DEBUG, "panel_heading", heading=heading_text)
+                
+                # Check for different evaluation types with more patterns
+                if any(term in heading_text.upper() for term in ['TECHNICAL', 'TECH EVAL', 'TECHNICAL EVALUATION']):
+                    evaluation_data["has_technical_evaluation"] = True
+                    technical_sellers = self.extract_technical_evaluation(soup, heading)
+                    all_sellers.extend(technical_sellers)
+                    log_event(logging.DEBUG, "evaluations_extracted", evaluation_type="technical", sellers=len(technical_sellers))
                 
-            elif any(term in heading_text.upper() for term in ['FINANCIAL', 'FIN EVAL', 'FINANCIAL EVALUATION']):
-                evaluation_data["has_financial_evaluation"] = True
-                financial_sellers = self.extract_financial_evaluation(soup, heading)
-                all_sellers.extend(financial_sellers)
-                print(f"    Extracted {len(financial_sellers)} financial evaluations")
+                elif any(term in heading_text.upper() for term in ['FINANCIAL', 'FIN EVAL', 'FINANCIAL EVALUATION']):
+                    evaluation_data["has_financial_evaluation"] = True
+                    financial_sellers = self.extract_financial_evaluation(soup, heading)
+                    all_sellers.extend(financial_sellers)
+                    log_event(logging.DEBUG, "evaluations_extracted", evaluation_type="financial", sellers=len(financial_sellers))
                 
-            elif 'EVALUATION' in heading_text.upper() and not any(term in heading_text.upper() for term in ['TECHNICAL', 'FINANCIAL']):
-                # This is the general "Evaluation" case
-                evaluation_data["has_general_evaluation"] = True
-                general_sellers = self.extract_general_evaluation(soup, heading)
-                all_sellers.extend(general_sellers)
-                print(f"    Extracted {len(general_sellers)} general evaluations")
+                elif 'EVALUATION' in heading_text.upper() and not any(term in heading_text.upper() for term in ['TECHNICAL', 'FINANCIAL']):
+                    # This is the general "Evaluation" case
+                    evaluation_data["has_general_evaluation"] = True
+                    general_sellers = self.extract_general_evaluation(soup, heading)
+                    all_sellers.extend(general_sellers)
+                    log_event(logging.DEBUG, "evaluations_extracted", evaluation_type="general", sellers=len(general_sellers))
         
         # Also look for tables directly without panel headings
         if not evaluation_data["has_general_evaluation"] and not evaluation_data["has_financial_evaluation"]:
-            # Look for any evaluation tables
-            tables = soup.find_all('table', class_='table')
-            for table in tables:
-                if self.is_evaluation_table(table):
-                    sellers = self.extract_sellers_from_table(table)
-                    if sellers:
-                        all_sellers.extend(sellers)
-                        evaluation_data["has_general_evaluation"] = True
-                        print(f"    Found evaluation table with {len(sellers)} sellers")
+            with self.parse_profiler.phase("table_scan"):
+                # Look for any evaluation tables
+                tables = soup.find_all('table', class_='table')
+                for table in tables:
+                    if self.is_evaluation_table(table):
+                        sellers = self.extract_sellers_from_table(table)
+                        if sellers:
+                            all_sellers.extend(sellers)
+                            evaluation_data["has_general_evaluation"] = True
+                            log_event(logging.DEBUG, "evaluation_table", sellers=len(sellers))
         
         # Store only the combined sellers list
         evaluation_data["sellers_participated"] = all_sellers
@@ -408,45 +2881,27 @@ class GeMBidScraper:
         if not raw_name:
             return ""
         
-        # Remove HTML tags
-        clean_name = re.sub(r'<[^>]+>', '', raw_name)
-        
-        # Remove MSE category info in parentheses
-        clean_name = re.sub(r'\s*\([^)]*MSE[^)]*\)', '', clean_name, flags=re.IGNORECASE)
-        clean_name = re.sub(r'\s*\([^)]*Social Category[^)]*\)', '', clean_name, flags=re.IGNORECASE)
-        
-        # Remove extra whitespace and line breaks
-        clean_name = re.sub(r'\s+', ' ', clean_name).strip()
-        
-        # Take only the first line if multiple lines
-        clean_name = clean_name.split('\n')[0].strip()
-        
-        return clean_name
+        return clean_seller_name_cached(raw_name)
     
     def extract_evaluations_with_regex(self, html_content: str, evaluation_data: Dict[str, Any]) -> Dict[str, Any]:
         """Fallback method using regex when BeautifulSoup is not available"""
         
         # Look for evaluation indicators
-        if re.search(r'technical\s+evaluat', html_content, re.IGNORECASE):
+        if TECHNICAL_EVALUATION_RE.search(html_content):
             evaluation_data["has_technical_evaluation"] = True
         
-        if re.search(r'financial\s+evaluat', html_content, re.IGNORECASE):
+        if FINANCIAL_EVALUATION_RE.search(html_content):
             evaluation_data["has_financial_evaluation"] = True
         
-        if re.search(r'evaluation|sellers?\s+participated', html_content, re.IGNORECASE):
+        if GENERAL_EVALUATION_RE.search(html_content):
             evaluation_data["has_general_evaluation"] = True
         
         # Try to extract seller names using regex
-        seller_patterns = [
-            r'<td[^>]*>\s*<span[^>]*>\s*([A-Z][A-Z\s&/.,-]+?)\s*<br',  # Seller names before <br>
-            r'<td[^>]*>\s*([A-Z][A-Z\s&/.,-]{10,}?)\s*</td>',  # Direct seller names in TD
-        ]
-        
         sellers_found = []
-        for pattern in seller_patterns:
-            matches = re.findall(pattern, html_content, re.IGNORECASE)
-            for match in matches[:10]:  # Limit to first 10 matches
-                clean_name = self.clean_seller_name(match)
+        for pattern in SELLER_NAME_RES:
+            # Stop scanning after the first 10 matches instead of collecting all of them
+            for match in islice(pattern.finditer(html_content), 10):
+                clean_name = self.clean_seller_name(match.group(1))
                 if len(clean_name) > 5:  # Only include substantial names
                     sellers_found.append({
                         "seller_name": clean_name,
@@ -455,7 +2910,7 @@ class GeMBidScraper:
         
         if sellers_found:
             evaluation_data["sellers_participated"] = sellers_found
-            print(f"    Regex extraction found {len(sellers_found)} sellers")
+            log_event(logging.DEBUG, "regex_extraction", sellers=len(sellers_found))
         
         return evaluation_data
     
@@ -650,68 +3105,584 @@ class GeMBidScraper:
         
         return minimal_evaluation
     
+    def build_bid_row(self, bid_info: Dict[str, Any]) -> tuple:
+        """Build the bid_evaluations row for a bid, in BID_UPSERT_SQL column order"""
+        # Prepare data for insertion
+        bid_id = bid_info.get('id', '')  # This will be the actual bid ID from the API
+        bid_number = bid_info.get('b_bid_number', '')
+        items = bid_info.get('b_category_name', '')
+        quantity = bid_info.get('b_total_quantity', 0)
+        ministry_name = bid_info.get('ba_official_details_minName', '')
+        department_name = bid_info.get('ba_official_details_deptName', '')
+        start_date = self.parse_date(bid_info.get('final_start_date_sort', ''))
+        end_date = self.parse_date(bid_info.get('final_end_date_sort', ''))
+        
+        # Prepare minimal evaluation JSON - only essential fields
+        evaluation_data = bid_info.get('evaluation_data', {})
+        parent_evaluation_data = bid_info.get('parent_evaluation_data', {})
+        
+        # Use the new method to prepare minimal data
+        evaluation_json = json.dumps(self.prepare_evaluation_for_database(evaluation_data)) if evaluation_data else None
+        parent_evaluation_json = json.dumps(self.prepare_evaluation_for_database(parent_evaluation_data)) if parent_evaluation_data else None
+        
+        return (bid_id, bid_number, items, quantity, ministry_name, department_name,
+                start_date, end_date, evaluation_json, parent_evaluation_json)
+    
+    def upsert_bid_rows(self, cur, rows: List[tuple]):
+        """Insert or update rows using bid_id as the primary key, in a single statement"""
+        conflict_target = "id"
+        if self.partitioned_table:
+            conflict_target = "id, end_date"
+            rows = [row[:7] + (row[7] or "-infinity",) + row[8:] for row in rows]
+            # The key includes end_date: drop the old row of a bid whose end date moved
+            psycopg2.extras.execute_values(cur, """
+                DELETE FROM bid_evaluations AS b USING (VALUES %s) AS v(id, end_date)
+                WHERE b.id = v.id AND b.end_date <> v.end_date::timestamp
+            """, [(row[0], row[7]) for row in rows], page_size=max(1, len(rows)))
+        psycopg2.extras.execute_values(cur, BID_UPSERT_SQL.format(conflict_target=conflict_target), rows,
+                                       page_size=max(1, len(rows)))
+        self.write_participations(cur, [(row[0], json.loads(row[8]) if row[8] else None,
+                                         json.loads(row[9]) if row[9] else None) for row in rows])
+    
+    def build_participation_rows(self, bid_id: Any, evaluation: Optional[Dict[str, Any]],
+                                 parent_evaluation: Optional[Dict[str, Any]]) -> List[tuple]:
+        """bid_participations rows for one bid, with the seller name in place of seller_id"""
+        rows = []
+        for is_parent, data in ((False, evaluation), (True, parent_evaluation)):
+            for position, seller in enumerate((data or {}).get("sellers_participated") or [], start=1):
+                name = (seller.get("seller_name") or "").strip()
+                if not name:
+                    continue
+                # Typed from the raw text again: rows stored by older versions lack the typed fields
+                # or have float prices and misread statuses, backfill-participations corrects them
+                seller = add_typed_seller_fields(dict(seller))
+                rank = seller.get("rank_value")
+                if not isinstance(rank, int) or not 0 <= rank <= PARTICIPATION_MAX_RANK:
+                    rank = None
+                price = seller.get("total_price_value")
+                price = Decimal(str(price)) if price is not None else None
+                if price is not None and not (price.is_finite() and abs(price) < PARTICIPATION_MAX_PRICE):
+                    price = None
+                evaluation_type, status = seller.get("evaluation_type"), seller.get("status")
+                rows.append((str(bid_id), is_parent, position, name[:500],
+                             evaluation_type[:20] if evaluation_type else None, seller.get("offered_item"), rank,
+                             price, status[:100] if status else None, seller.get("status_value")))
+        return rows
+    
+    def write_participations(self, cur, bids: List[Tuple[Any, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]):
+        """Replace the normalized seller rows of (bid id, evaluation, parent evaluation) entries"""
+        rows = [row for bid in bids for row in self.build_participation_rows(*bid)]
+        cur.execute("DELETE FROM bid_participations WHERE bid_id = ANY(%s)", ([str(bid[0]) for bid in bids],))
+        if not rows:
+            return
+        
+        # DO NOTHING plus a lookup instead of DO UPDATE ... RETURNING: no row versions for known sellers
+        names = sorted({row[3] for row in rows})
+        psycopg2.extras.execute_values(cur, "INSERT INTO sellers (name) VALUES %s ON CONFLICT (name) DO NOTHING",
+                                       [(name,) for name in names], page_size=max(1, len(names)))
+        cur.execute("SELECT name, id FROM sellers WHERE name = ANY(%s)", (names,))
+        seller_ids = dict(cur.fetchall())
+        
+        psycopg2.extras.execute_values(cur, """
+            INSERT INTO bid_participations
+            (bid_id, is_parent, position, seller_id, evaluation_type, offered_item, rank, total_price,
+             status, status_value)
+            VALUES %s
+        """, [row[:3] + (seller_ids[row[3]],) + row[4:] for row in rows], page_size=1000)
+    
+    def backfill_participations(self, batch_size: int = 1000) -> int:
+        """Fill sellers and bid_participations from the JSONB of every stored bid, returns bids processed"""
+        def backfill_batch(conn, after: str):
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT id, evaluation, parent_evaluation FROM bid_evaluations
+                    WHERE id > %s ORDER BY id LIMIT %s
+                """, (after, batch_size))
+                bids = cur.fetchall()
+                if bids:
+                    self.write_participations(cur, bids)
+                return bids
+        
+        processed, last_id = 0, ""
+        while True:
+            bids = self.db.run(lambda conn: backfill_batch(conn, last_id))
+            if not bids:
+                break
+            processed += len(bids)
+            last_id = bids[-1][0]
+            print(f"  ✓ Backfilled participations for {processed} bids")
+        
+        print(f"Backfill complete: {processed} bids")
+        return processed
+    
     def save_to_database(self, bid_info: Dict[str, Any]) -> bool:
         """Save bid information to PostgreSQL database"""
         try:
-            conn = psycopg2.connect(**self.db_config)
-            cur = conn.cursor()
-            
-            # Prepare data for insertion
-            bid_id = bid_info.get('id', '')  # This will be the actual bid ID from the API
-            bid_number = bid_info.get('b_bid_number', '')
-            items = bid_info.get('b_category_name', '')
-            quantity = bid_info.get('b_total_quantity', 0)
-            ministry_name = bid_info.get('ba_official_details_minName', '')
-            department_name = bid_info.get('ba_official_details_deptName', '')
-            start_date = self.parse_date(bid_info.get('final_start_date_sort', ''))
-            end_date = self.parse_date(bid_info.get('final_end_date_sort', ''))
-            
-            # Prepare minimal evaluation JSON - only essential fields
-            evaluation_data = bid_info.get('evaluation_data', {})
-            parent_evaluation_data = bid_info.get('parent_evaluation_data', {})
-            
-            # Use the new method to prepare minimal data
-            evaluation_json = json.dumps(self.prepare_evaluation_for_database(evaluation_data)) if evaluation_data else None
-            parent_evaluation_json = json.dumps(self.prepare_evaluation_for_database(parent_evaluation_data)) if parent_evaluation_data else None
-            
-            # Insert or update record using bid_id as the primary key
-            cur.execute("""
-                INSERT INTO bid_evaluations 
-                (id, bid_number, items, quantity, ministry_name, department_name, start_date, end_date, evaluation, parent_evaluation)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (id) 
-                DO UPDATE SET
-                    bid_number = EXCLUDED.bid_number,
-                    items = EXCLUDED.items,
-                    quantity = EXCLUDED.quantity,
-                    ministry_name = EXCLUDED.ministry_name,
-                    department_name = EXCLUDED.department_name,
-                    start_date = EXCLUDED.start_date,
-                    end_date = EXCLUDED.end_date,
-                    evaluation = EXCLUDED.evaluation,
-                    parent_evaluation = EXCLUDED.parent_evaluation,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (bid_id, bid_number, items, quantity, ministry_name, department_name, 
-                  start_date, end_date, evaluation_json, parent_evaluation_json))
+            row = self.build_bid_row(bid_info)
+            self.ensure_partitions([row[7]])
             
-            conn.commit()
-            cur.close()
-            conn.close()
+            def upsert(conn):
+                with conn.cursor() as cur:
+                    self.upsert_bid_rows(cur, [row])
+            
+            self.db.run(upsert)
             
-            print(f"  ✓ Saved to database: {bid_number} (ID: {bid_id})")
+            log_event(logging.DEBUG, "bid_saved", bid_id=row[0], bid_number=row[1])
             return True
             
         except Exception as e:
-            print(f"  ✗ Database error for {bid_info.get('b_bid_number', 'Unknown')} (ID: {bid_info.get('id', 'Unknown')}): {e}")
+            log_event(logging.ERROR, "bid_save_failed", bid_id=bid_info.get("id"), bid_number=bid_info.get("b_bid_number"), error=str(e))
             return False
     
-    def process_all_bids(self, start_page: int = 1, end_page: int = 1000):
+    async def enrich_bid_async(self, http: aiohttp.ClientSession, bid_info: Dict[str, Any],
+                               checkpoint: Optional[CrawlCheckpoint] = None) -> Dict[str, Any]:
+        """Attach main, single packet and parent result views to a bid"""
+        if not bid_info["id"]:
+            return bid_info
+        
+        bid_id = str(bid_info["id"])
+        result_view = None
+        html_content = await self.fetch_result_view_html_async(http, bid_id)
+        if html_content is not None:
+            if checkpoint:
+                checkpoint.mark(bid_id, "fetched")
+            result_view = await self.parse_result_view_async(html_content, bid_id)
+        if result_view:
+            bid_info["evaluation_data"] = result_view
+            
+            # Fall back to getSinglePacketResultView when the main view has no evaluation data
+            if not self.has_any_evaluation(result_view):
+                log_event(logging.DEBUG, "single_packet_fallback", bid_id=bid_id)
+                single_packet_view = await self.get_bid_result_view_async(http, bid_id, is_parent=True)
+                if self.has_any_evaluation(single_packet_view):
+                    log_event(logging.DEBUG, "single_packet_evaluation_found", bid_id=bid_id)
+                    bid_info["evaluation_data"] = single_packet_view
+                    bid_info["evaluation_source"] = "single_packet_view"
+                else:
+                    bid_info["evaluation_source"] = "main_view_empty"
+            else:
+                bid_info["evaluation_source"] = "main_view"
+        
+        # If parent bid exists, get its result view too
+        if bid_info.get("b_id_parent"):
+            parent_result_view = await self.get_parent_result_view_async(http, str(bid_info["b_id_parent"]))
+            if parent_result_view:
+                bid_info["parent_evaluation_data"] = parent_result_view
+        
+        # Check if evaluation data contains parent bid reference
+        elif result_view and result_view.get("parent_bid_id_found"):
+            parent_id = result_view["parent_bid_id_found"]
+            log_event(logging.DEBUG, "parent_id_in_html", bid_id=bid_id, parent_id=parent_id)
+            parent_result_view = await self.get_parent_result_view_async(http, parent_id)
+            if parent_result_view:
+                bid_info["parent_evaluation_data"] = parent_result_view
+                bid_info["b_id_parent"] = parent_id
+        
+        if checkpoint and result_view:
+            checkpoint.mark(bid_id, "parsed")
+        return bid_info
+    
+    def create_async_session(self, concurrency: int) -> aiohttp.ClientSession:
+        """Create an aiohttp session sized for the given concurrency, with connect and read timeouts"""
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        # sock_connect rather than connect: waiting for a pooled connection is not a stuck server
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+    
+    async def fetch_result_views_async(self, bid_infos: List[Dict[str, Any]], concurrency: int) -> List[Dict[str, Any]]:
+        """Enrich many bids at once, at most `concurrency` bids in flight"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        with self.parse_workers(), self.parent_evaluations():
+            async with self.create_async_session(concurrency) as http:
+                async def enrich(bid_info: Dict[str, Any]) -> Dict[str, Any]:
+                    async with semaphore:
+                        return await self.enrich_bid_async(http, bid_info)
+                
+                return await asyncio.gather(*(enrich(bid_info) for bid_info in bid_infos))
+    
+    def fetch_result_views(self, bid_infos: List[Dict[str, Any]], concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch result views for all bids concurrently, returns bid_info dicts in input order
+        """
+        return asyncio.run(self.fetch_result_views_async(bid_infos, concurrency or self.concurrency))
+    
+    async def listing_stage(self, http: aiohttp.ClientSession, start_page: int, end_page: int,
+                            bid_queue: asyncio.Queue, stats: Dict[str, Any], known_ids: Optional[set] = None,
+                            checkpoint: Optional[CrawlCheckpoint] = None, split_windows: bool = False,
+                            slices: Optional[List[Tuple[Optional[str], Dict[str, Any]]]] = None):
+        """
+        Producer: queue extracted bid info as soon as each listing page arrives.
+        slices are the (name, filter) combinations to list, all in parallel (default: the crawl's
+        filter); a bid listed by several of them is queued once.
+        With split_windows each filter's end date range is listed as sub-windows small enough
+        to paginate reliably (see listing_window_max_results), all in parallel.
+        With known_ids (incremental mode) stored bids are skipped, and listing of a window stops
+        once incremental_stop_pages consecutive pages hold nothing but known bids.
+        With a resumed checkpoint, its unsaved bids are queued first and its saved bids skipped
+        """
+        # Only ids are kept, so memory stays flat regardless of the page range.
+        # Shared by all slices and windows: a bid listed twice is fetched once
+        seen_ids = set()
+        # Bounds listing requests across all slices and windows
+        listing_slots = asyncio.Semaphore(self.listing_concurrency)
+        
+        if checkpoint:
+            seen_ids.update(checkpoint.done_ids)
+            pending_bids, checkpoint.pending_bids = checkpoint.pending_bids, []
+            if pending_bids:
+                log_event(logging.INFO, "resume_pending_bids", run_id=checkpoint.run_id, bids=len(pending_bids))
+            for bid_info in pending_bids:
+                seen_ids.add(str(bid_info["id"]))
+                await bid_queue.put(bid_info)
+                stats["listed"] += 1
+        
+        async def fetch_page(listing_filter: Dict[str, Any], page: int, label: Optional[str]) -> Optional[Dict[str, Any]]:
+            async with listing_slots:
+                return await self.fetch_listing_page_async(http, page, listing_filter, label)
+        
+        async def list_slice(listing_filter: Dict[str, Any], label: Optional[str] = None,
+                             first_page: Optional[Dict[str, Any]] = None):
+            """List the pages of one filter; first_page is a page 1 result already fetched"""
+            listing = checkpoint.listing(listing_filter, start_page) if checkpoint else None
+            slice_start = listing.last_completed_page + 1 if listing else start_page
+            slice_end = end_page
+            if listing and listing.last_page is not None:
+                slice_end = min(slice_end, listing.last_page)
+            # Completed pages -> whether every bid on them was already stored
+            known_pages: Dict[int, bool] = {}
+            stop_listing = asyncio.Event()
+            failed_pages = []
+            
+            def page_failed(page: int):
+                self.metrics.inc("gem_listing_pages_total", result="failed")
+                failed_pages.append(page)
+                stats["failed_pages"].append(page if label is None else f"{label} page {page}")
+            
+            async def queue_page(page: int, result: Dict[str, Any]):
+                self.metrics.inc("gem_listing_pages_total", result="ok")
+                all_known = known_ids is not None and bool(result["docs"])
+                
+                for doc in result["docs"]:
+                    bid_id = self.get_bid_id(doc)
+                    if known_ids is not None and str(bid_id) in known_ids:
+                        stats["skipped_known"] += 1
+                        self.metrics.inc("gem_bids_total", stage="skipped_known")
+                        continue
+                    all_known = False
+                    
+                    if bid_id is not None:
+                        if str(bid_id) in seen_ids:
+                            stats["duplicates"] += 1
+                            self.metrics.inc("gem_bids_total", stage="duplicate")
+                            continue
+                        seen_ids.add(str(bid_id))
+                    
+                    bid_info = self.extract_bid_info(doc)
+                    if checkpoint:
+                        checkpoint.mark(bid_id, "listed", bid_info)
+                    # Blocks while the queue is full, so listing never runs far ahead of fetching
+                    await bid_queue.put(bid_info)
+                    stats["listed"] += 1
+                    self.metrics.inc("gem_bids_total", stage="listed")
+                
+                if listing:
+                    checkpoint.page_done(listing, page)
+                
+                if known_ids is not None:
+                    known_pages[page] = all_known
+                    if all_known and self.known_page_run(known_pages, page) >= self.incremental_stop_pages:
+                        if not stop_listing.is_set():
+                            log_event(logging.INFO, "listing_stopped_known", slice=label, page=page)
+                            stats["stopped_at_page"] = page
+                        stop_listing.set()
+            
+            if slice_start > slice_end:
+                log_event(logging.INFO, "listing_already_completed", slice=label)
+                return
+            
+            if first_page is None or slice_start != 1:
+                first_page = await fetch_page(listing_filter, slice_start, label)
+            if not first_page or not first_page["docs"]:
+                log_event(logging.INFO, "listing_empty", slice=label, page=slice_start)
+                if first_page is None:
+                    page_failed(slice_start)
+                elif listing:
+                    checkpoint.set_last_page(listing, slice_start)
+                    checkpoint.listing_complete(listing)
+                return
+            
+            num_found = int(first_page.get("numFound") or 0)
+            last_page = self.plan_last_page(slice_start, slice_end, num_found, len(first_page["docs"]))
+            log_event(logging.INFO, "listing_planned", slice=label, num_found=num_found, first_page=slice_start, last_page=last_page)
+            if listing:
+                checkpoint.set_last_page(listing, last_page)
+            await queue_page(slice_start, first_page)
+            
+            # Workers share one page iterator, so each page is fetched exactly once
+            pages = iter(range(slice_start + 1, last_page + 1))
+            
+            async def page_worker():
+                for page in pages:
+                    if stop_listing.is_set():
+                        break
+                    result = await fetch_page(listing_filter, page, label)
+                    if result is None:
+                        page_failed(page)
+                    else:
+                        await queue_page(page, result)
+            
+            await asyncio.gather(*(page_worker() for _ in range(self.listing_concurrency)))
+            
+            # Failed pages keep the watermark below them, so a resume lists them again
+            if listing and not failed_pages:
+                checkpoint.listing_complete(listing)
+        
+        async def list_window(listing_filter: Dict[str, Any], name: Optional[str] = None):
+            """Probe an end date window with its first page and list it, or its halves if it is too large"""
+            window = get_end_date_window(listing_filter)
+            if window is None:
+                log_event(logging.WARNING, "window_split_unavailable", slice=name, reason="no byEndDate range")
+                return await list_slice(listing_filter, name)
+            
+            label = f"{name + ' ' if name else ''}{window[0]:%Y-%m-%d}..{window[1]:%Y-%m-%d}"
+            # Only windows that were small enough get listing progress, so a resumed one is listed as is
+            if checkpoint and listing_filter_key(listing_filter) in checkpoint.listings:
+                return await list_slice(listing_filter, label)
+            
+            first_page = await fetch_page(listing_filter, 1, label)
+            num_found = int(first_page.get("numFound") or 0) if first_page else 0
+            if num_found > self.listing_window_max_results:
+                if window[0] < window[1]:
+                    middle = window[0] + timedelta(days=(window[1] - window[0]).days // 2)
+                    log_event(logging.INFO, "window_split", slice=label, num_found=num_found, max_results=self.listing_window_max_results)
+                    await asyncio.gather(
+                        list_window(with_end_date_window(listing_filter, window[0], middle), name),
+                        list_window(with_end_date_window(listing_filter, middle + timedelta(days=1), window[1]), name))
+                    return
+                log_event(logging.WARNING, "window_too_large", slice=label, num_found=num_found, max_results=self.listing_window_max_results)
+            
+            await list_slice(listing_filter, label, first_page)
+        
+        slices = slices or [(None, self.listing_filter)]
+        if split_windows:
+            await asyncio.gather(*(list_window(listing_filter, name) for name, listing_filter in slices))
+        else:
+            await asyncio.gather(*(list_slice(listing_filter, name) for name, listing_filter in slices))
+    
+    def known_page_run(self, known_pages: Dict[int, bool], page: int) -> int:
+        """Length of the run of consecutive completed all-known pages around a page"""
+        first = page
+        while known_pages.get(first - 1):
+            first -= 1
+        last = page
+        while known_pages.get(last + 1):
+            last += 1
+        return last - first + 1
+    
+    def load_known_bids(self, refresh_days: Optional[int] = None) -> set:
+        """
+        Ids of bids already stored with a non-empty evaluation (at least one seller).
+        With refresh_days, rows not updated within that many days are treated as unknown
+        """
+        def query(conn):
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT id FROM bid_evaluations
+                    WHERE jsonb_array_length(COALESCE(evaluation->'sellers_participated', '[]'::jsonb)) > 0
+                    AND (%(days)s::integer IS NULL OR updated_at >= NOW() - %(days)s::integer * INTERVAL '1 day')
+                """, {"days": refresh_days})
+                return {row[0] for row in cur}
+        
+        return self.db.run(query)
+    
+    async def result_view_stage(self, http: aiohttp.ClientSession, bid_queue: asyncio.Queue, save_queue: asyncio.Queue,
+                                checkpoint: Optional[CrawlCheckpoint] = None):
+        """Worker: fetch and parse result views for queued bids"""
+        while True:
+            bid_info = await bid_queue.get()
+            if bid_info is None:
+                break
+            
+            started = time.perf_counter()
+            try:
+                bid_info = await self.enrich_bid_async(http, bid_info, checkpoint)
+                self.metrics.observe("gem_enrich_seconds", time.perf_counter() - started)
+            except Exception as e:
+                self.metrics.inc("gem_bids_total", stage="enrich_error")
+                log_event(logging.ERROR, "enrich_failed", bid_id=bid_info.get("id"), error=str(e))
+            
+            await save_queue.put(bid_info)
+    
+    async def database_stage(self, save_queue: asyncio.Queue, stats: Dict[str, Any],
+                             checkpoint: Optional[CrawlCheckpoint] = None):
+        """Consumer: batch enriched bids into bulk upserts and keep running counts only"""
+        writer = BidBatchWriter(self, self.db_batch_size, self.db_flush_interval)
+        
+        def write_batch():
+            saved, failures = writer.flush()
+            # Checkpoint after the rows are committed: a crash in between only repeats this batch
+            if checkpoint:
+                checkpoint.mark_saved(saved)
+                checkpoint.flush()
+            return saved, failures
+        
+        def report(saved, failures):
+            stats["saved"] += len(saved)
+            stats["failed"] += len(failures)
+            if saved:
+                log_event(logging.DEBUG, "batch_saved", bids=len(saved))
+            for bid_id, bid_number, error in failures:
+                log_event(logging.ERROR, "bid_save_failed", bid_id=bid_id, bid_number=bid_number, error=error)
+        
+        async def flush():
+            # psycopg2 is blocking, keep it off the event loop
+            report(*await asyncio.to_thread(write_batch))
+        
+        started = last_progress = time.monotonic()
+        last_processed = 0
+        
+        def report_progress(force: bool = False):
+            nonlocal last_progress, last_processed
+            now = time.monotonic()
+            if not force and now - last_progress < self.log_progress_interval:
+                return
+            log_event(logging.INFO, "progress", listed=stats["listed"], processed=stats["processed"],
+                      saved=stats["saved"], failed=stats["failed"],
+                      rate=round((stats["processed"] - last_processed) / max(now - last_progress, 1e-9), 2),
+                      avg_rate=round(stats["processed"] / max(now - started, 1e-9), 2))
+            last_progress, last_processed = now, stats["processed"]
+        
+        try:
+            while True:
+                try:
+                    bid_info = await asyncio.wait_for(save_queue.get(), timeout=writer.flush_interval)
+                except asyncio.TimeoutError:
+                    if writer.should_flush() or (checkpoint and checkpoint.has_pending()):
+                        await flush()
+                    report_progress()
+                    continue
+                
+                if bid_info is None:
+                    break
+            
+                stats["processed"] += 1
+                self.display_bid_info(bid_info)
+                writer.add(bid_info)
+                report_progress()
+                
+                evaluation_data = bid_info.get("evaluation_data") or {}
+                stats["technical"] += bool(evaluation_data.get("has_technical_evaluation"))
+                stats["financial"] += bool(evaluation_data.get("has_financial_evaluation"))
+                stats["general"] += bool(evaluation_data.get("has_general_evaluation"))
+                stats["parent"] += bool(bid_info.get("parent_evaluation_data"))
+                
+                if writer.should_flush():
+                    await flush()
+            
+            await flush()
+            report_progress(force=True)
+        except asyncio.CancelledError:
+            # Interrupted: still write the bids already fetched, blocking is fine at this point
+            report(*write_batch())
+            raise
+    
+    async def monitor_queues(self, queues: Dict[str, asyncio.Queue], interval: float = 0.5):
+        """Sample pipeline queue depths into gauges until cancelled"""
+        while True:
+            for name, queue in queues.items():
+                self.metrics.set_gauge("gem_queue_depth", queue.qsize(), queue=name)
+                self.metrics.max_gauge("gem_queue_depth_max", queue.qsize(), queue=name)
+            await asyncio.sleep(interval)
+    
+    async def run_pipeline_async(self, start_page: int, end_page: int, concurrency: int,
+                                 known_ids: Optional[set] = None,
+                                 checkpoint: Optional[CrawlCheckpoint] = None,
+                                 split_windows: bool = False,
+                                 slices: Optional[List[Tuple[Optional[str], Dict[str, Any]]]] = None) -> Dict[str, Any]:
+        """
+        Streaming pipeline with bounded queues between stages:
+        listing pages -> extract_bid_info -> result view fetch/parse -> database writer.
+        With a checkpoint every stage records its progress, and the run status is
+        updated however the pipeline ends
+        """
+        stats: Dict[str, Any] = {
+            "listed": 0, "processed": 0, "saved": 0, "failed": 0,
+            "technical": 0, "financial": 0, "general": 0, "parent": 0,
+            "skipped_known": 0, "duplicates": 0, "stopped_at_page": None, "failed_pages": []
+        }
+        bid_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        save_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        
+        with self.parse_workers(), self.parent_evaluations():
+            async with self.create_async_session(concurrency + self.listing_concurrency) as http:
+                listing = asyncio.create_task(self.listing_stage(http, start_page, end_page, bid_queue, stats,
+                                                                 known_ids, checkpoint, split_windows, slices))
+                fetchers = [asyncio.create_task(self.result_view_stage(http, bid_queue, save_queue, checkpoint))
+                            for _ in range(concurrency)]
+                writer = asyncio.create_task(self.database_stage(save_queue, stats, checkpoint))
+                monitor = asyncio.create_task(self.monitor_queues({"bids": bid_queue, "save": save_queue}))
+                
+                status = "failed"
+                try:
+                    await listing
+                    for _ in fetchers:
+                        await bid_queue.put(None)
+                    await asyncio.gather(*fetchers)
+                    await save_queue.put(None)
+                    await writer
+                    status = "partial" if stats["failed"] or stats["failed_pages"] else "completed"
+                except (asyncio.CancelledError, KeyboardInterrupt):
+                    status = "interrupted"
+                    raise
+                finally:
+                    monitor.cancel()
+                    for task in [listing, writer] + fetchers:
+                        task.cancel()
+                    # Let the writer save what it holds before the run status is recorded
+                    await asyncio.gather(listing, writer, *fetchers, return_exceptions=True)
+                    if checkpoint:
+                        await asyncio.to_thread(checkpoint.finish, status)
+                        log_event(logging.INFO, "crawl_run_finished", run_id=checkpoint.run_id, status=status)
+        
+        return stats
+    
+    def process_all_bids(self, start_page: int = 1, end_page: int = 1000, concurrency: Optional[int] = None,
+                         incremental: bool = False, refresh_days: Optional[int] = None,
+                         checkpoint: Optional[CrawlCheckpoint] = None,
+                         end_date_range: Optional[Tuple[str, str]] = None,
+                         slices: Optional[List[Tuple[Optional[str], Dict[str, Any]]]] = None,
+                         split_windows: bool = False) -> Dict[str, Any]:
         """
-        Main processing function with enhanced evaluation extraction and database storage
+        Main processing function with enhanced evaluation extraction and database storage.
+        Runs as a streaming pipeline and returns run statistics.
+        incremental skips bids already stored with evaluations and stops paginating early.
+        slices are (name, listing filter) combinations crawled together (see run_crawl_plan).
+        end_date_range ("YYYY-MM-DD", "YYYY-MM-DD") crawls bids ending in that range, split into
+        parallel windows of at most listing_window_max_results bids; pages apply to each window.
+        Progress is checkpointed as a crawl run (see resume_crawl); pass checkpoint to continue one
         """
         print("=== Enhanced GeM Bid Data Scraper with PostgreSQL Storage (Minimal JSON) ===")
         print(f"Processing pages {start_page} to {end_page}")
         
+        if checkpoint is not None:
+            slices = slices or checkpoint.params.get("slices")
+            split_windows = split_windows or bool(checkpoint.params.get("split_windows"))
+        slices = [(name, listing_filter) for name, listing_filter in slices or [(None, self.listing_filter)]]
+        if end_date_range:
+            try:
+                date_from, date_to = (datetime.strptime(value, "%Y-%m-%d") for value in end_date_range)
+            except ValueError:
+                print(f"Invalid end date range {end_date_range}, expected YYYY-MM-DD dates")
+                return {}
+            slices = [(name, with_end_date_window(listing_filter, date_from, date_to))
+                      for name, listing_filter in slices]
+            split_windows = True
+            print(f"Bids ending {date_from:%Y-%m-%d} to {date_to:%Y-%m-%d}, "
+                  f"in windows of at most {self.listing_window_max_results} bids")
+        if len(slices) > 1:
+            print(f"Crawling {len(slices)} filter slices together: {', '.join(name or '-' for name, _ in slices)}")
+        
         # Check if authentication values are set
         if not self.cookie_value or not self.csrf_token:
             print("\n❌ ERROR: Authentication values not set!")
@@ -722,229 +3693,269 @@ class GeMBidScraper:
             print("1. Visit https://bidplus.gem.gov.in/all-bids in your browser")
             print("2. Open Developer Tools -> Network tab")
             print("3. Make a search request and copy the Cookie header and csrf_bd_gem_nk values")
-            return []
-        
-        # Fetch all bids with pagination
-        print("\nFetching all bids data with pagination...")
-        bids_data = self.fetch_all_bids_paginated(start_page, end_page)
+            return {}
         
-        if not bids_data:
-            print("No bids data retrieved. Exiting.")
-            return []
+        known_ids = None
+        if incremental:
+            try:
+                known_ids = self.load_known_bids(refresh_days)
+                print(f"Incremental mode: {len(known_ids)} bids already stored will be skipped")
+            except Exception as e:
+                print(f"Could not load stored bids, running a full crawl: {e}")
         
-        processed_bids = []
-        successful_saves = 0
-        failed_saves = 0
+        if checkpoint is None and self.checkpoints_enabled:
+            params = {"start_page": start_page, "end_page": end_page, "concurrency": concurrency,
+                      "incremental": incremental, "refresh_days": refresh_days, "split_windows": split_windows,
+                      "slices": slices}
+            try:
+                checkpoint = CrawlCheckpoint.create(self, params, self.listing_filter)
+                print(f"Crawl run {checkpoint.run_id} (continue it with: python working.py resume {checkpoint.run_id})")
+            except Exception as e:
+                print(f"Could not create crawl checkpoint, running without resume support: {e}")
         
-        for idx, bid in enumerate(bids_data):
-            print(f"\nProcessing bid {idx + 1}/{len(bids_data)}: {bid.get('b_bid_number', 'Unknown')}")
-            
-            # Extract basic bid info
-            bid_info = self.extract_bid_info(bid)
-            
-            # Get detailed bid result view
-            if bid_info["id"]:
-                print(f"  Fetching result view for bid ID: {bid_info['id']}")
-                result_view = self.get_bid_result_view(bid_info["id"])
-                if result_view:
-                    bid_info["evaluation_data"] = result_view
-                    
-                    # Check if main bid has no evaluation data (all False)
-                    has_any_evaluation = (result_view.get("has_financial_evaluation", False) or 
-                                        result_view.get("has_technical_evaluation", False) or 
-                                        result_view.get("has_general_evaluation", False))
-                    
-                    if not has_any_evaluation:
-                        print(f"  No evaluation found in main view, trying getSinglePacketResultView...")
-                        single_packet_view = self.get_bid_result_view(bid_info["id"], is_parent=True)
-                        if single_packet_view:
-                            # Check if single packet view has evaluation data
-                            has_single_packet_evaluation = (single_packet_view.get("has_financial_evaluation", False) or 
-                                                           single_packet_view.get("has_technical_evaluation", False) or 
-                                                           single_packet_view.get("has_general_evaluation", False))
-                            
-                            if has_single_packet_evaluation:
-                                print(f"  Found evaluation data in getSinglePacketResultView!")
-                                bid_info["evaluation_data"] = single_packet_view
-                                bid_info["evaluation_source"] = "single_packet_view"
-                            else:
-                                bid_info["evaluation_source"] = "main_view_empty"
-                        else:
-                            bid_info["evaluation_source"] = "main_view_empty"
-                    else:
-                        bid_info["evaluation_source"] = "main_view"
-                
-                # If parent bid exists, get its result view too
-                if bid_info.get("b_id_parent"):
-                    print(f"  Fetching parent result view for bid ID: {bid_info['b_id_parent']}")
-                    parent_result_view = self.get_bid_result_view(str(bid_info["b_id_parent"]), is_parent=True)
-                    if parent_result_view:
-                        bid_info["parent_evaluation_data"] = parent_result_view
-                
-                # Check if evaluation data contains parent bid reference
-                elif result_view and result_view.get("parent_bid_id_found"):
-                    parent_id = result_view["parent_bid_id_found"]
-                    print(f"  Found parent bid ID in HTML: {parent_id}")
-                    parent_result_view = self.get_bid_result_view(parent_id, is_parent=True)
-                    if parent_result_view:
-                        bid_info["parent_evaluation_data"] = parent_result_view
-                        bid_info["b_id_parent"] = parent_id
-            
-            processed_bids.append(bid_info)
-            
-            # Enhanced display of current bid info
-            self.display_bid_info(bid_info)
-            
-            # Save to database
-            if self.save_to_database(bid_info):
-                successful_saves += 1
-            else:
-                failed_saves += 1
-            
-            print("  " + "-" * 80)
-            
-            # Add delay to avoid overwhelming the server
-            time.sleep(1)
+        concurrency = concurrency or self.concurrency
+        print(f"\nStreaming listing -> result views -> database (concurrency: {concurrency})...")
+        stats = asyncio.run(self.run_pipeline_async(start_page, end_page, concurrency, known_ids, checkpoint,
+                                                    split_windows, slices))
         
         print(f"\n=== Processing Complete ===")
-        print(f"Total bids processed: {len(processed_bids)}")
-        print(f"Successfully saved to database: {successful_saves}")
-        print(f"Failed to save: {failed_saves}")
-        
-        # Summary statistics
-        technical_count = sum(1 for bid in processed_bids if bid.get("evaluation_data", {}).get("has_technical_evaluation"))
-        financial_count = sum(1 for bid in processed_bids if bid.get("evaluation_data", {}).get("has_financial_evaluation"))
-        general_count = sum(1 for bid in processed_bids if bid.get("evaluation_data", {}).get("has_general_evaluation"))
-        parent_count = sum(1 for bid in processed_bids if bid.get("parent_evaluation_data"))
+        print(f"Total bids processed: {stats['processed']}")
+        print(f"Successfully saved to database: {stats['saved']}")
+        print(f"Failed to save: {stats['failed']}")
+        if incremental:
+            print(f"Skipped (already stored): {stats['skipped_known']}")
+            if stats["stopped_at_page"]:
+                print(f"Stopped early at page: {stats['stopped_at_page']}")
+        if stats["duplicates"]:
+            print(f"Listed more than once (fetched once): {stats['duplicates']}")
+        if stats["failed_pages"]:
+            print(f"Failed listing pages: {sorted(stats['failed_pages'], key=str)}")
+        print(f"Final request rates: {self.rate_limiter.describe()}")
         
         print(f"\nEvaluation Statistics:")
-        print(f"  Technical Evaluations: {technical_count}")
-        print(f"  Financial Evaluations: {financial_count}")
-        print(f"  General Evaluations: {general_count}")
-        print(f"  Parent Bid Evaluations: {parent_count}")
+        print(f"  Technical Evaluations: {stats['technical']}")
+        print(f"  Financial Evaluations: {stats['financial']}")
+        print(f"  General Evaluations: {stats['general']}")
+        print(f"  Parent Bid Evaluations: {stats['parent']}")
+        
+        print(f"\n{self.metrics.summary()}")
         
-        return processed_bids
+        return stats
     
-    def display_bid_info(self, bid_info: Dict[str, Any]):
-        """Enhanced display of bid information"""
-        print(f"  Bid ID: {bid_info['id']}")  # Now showing the actual bid ID
-        print(f"  Bid Number: {bid_info['b_bid_number']}")
-        print(f"  Category: {bid_info['b_category_name']}")
-        print(f"  Quantity: {bid_info['b_total_quantity']}")
-        print(f"  Status: {bid_info['b_status']}")
-        print(f"  Start Date: {bid_info['final_start_date_sort']}")
-        print(f"  End Date: {bid_info['final_end_date_sort']}")
-        print(f"  Ministry: {bid_info['ba_official_details_minName']}")
-        print(f"  Department: {bid_info['ba_official_details_deptName']}")
-        print(f"  Category ID: {bid_info['b_cat_id']}")
-        if bid_info.get("bbt_title"):
-            print(f"  Title: {bid_info['bbt_title']}")
-        if bid_info.get("b_id_parent"):
-            print(f"  Parent Bid ID: {bid_info['b_id_parent']}")
-            print(f"  Parent Bid Number: {bid_info['b_bid_number_parent']}")
-        
-        # Show evaluation source
-        if bid_info.get("evaluation_source"):
-            print(f"  Evaluation Source: {bid_info['evaluation_source']}")
-        
-        # Display evaluation data if available
-        evaluation_data = bid_info.get("evaluation_data")
-        if evaluation_data and isinstance(evaluation_data, dict):
-            print(f"  MAIN BID EVALUATION:")
-            print(f"    Financial: {'Yes' if evaluation_data.get('has_financial_evaluation', False) else 'No'}")
-            print(f"    Technical: {'Yes' if evaluation_data.get('has_technical_evaluation', False) else 'No'}")
-            print(f"    General: {'Yes' if evaluation_data.get('has_general_evaluation', False) else 'No'}")
-            
-            # Display sellers participated summary
-            sellers = evaluation_data.get('sellers_participated', [])
-            if isinstance(sellers, list) and sellers:
-                print(f"    Total Sellers Participated: {len(sellers)}")
-                # Show first 3 sellers
-                for i, seller in enumerate(sellers[:3]):
-                    if isinstance(seller, dict):
-                        print(f"      {seller.get('s_no', i+1)}. {seller.get('seller_name', 'Unknown')}")
-                        if 'total_price' in seller and seller['total_price']:
-                            print(f"         Price: ₹{seller.get('total_price')}")
-                        if 'rank' in seller and seller['rank']:
-                            print(f"         Rank: {seller.get('rank')}")
-                        if 'status' in seller and seller['status']:
-                            print(f"         Status: {seller.get('status')}")
-                        if 'evaluation_type' in seller:
-                            print(f"         Type: {seller.get('evaluation_type')}")
+    def run_crawl_plan(self, path: str) -> Dict[str, Any]:
+        """
+        Crawl every slice of a crawl plan file (see load_crawl_plan) in one run, sharing the
+        HTTP session, rate limits, workers and database writer between them
+        """
+        try:
+            plan = load_crawl_plan(path, self.listing_filter)
+        except (OSError, ValueError) as e:
+            print(f"Could not load crawl plan: {e}")
+            return {}
+        
+        print(f"Crawl plan {path}: {len(plan['slices'])} slices")
+        return self.process_all_bids(plan.get("start_page", 1), plan.get("end_page", 1000), plan.get("concurrency"),
+                                     bool(plan.get("incremental", False)), plan.get("refresh_days"),
+                                     slices=plan["slices"], split_windows=bool(plan.get("split_windows", False)))
+    
+    def resume_crawl(self, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Continue an interrupted crawl run (the latest unfinished one without run_id):
+        bids it listed but did not save are fetched first, then listing goes on
+        after the last completed page of each window with the run's own filter
+        """
+        try:
+            checkpoint = CrawlCheckpoint.load(self, run_id)
+        except Exception as e:
+            print(f"Could not load crawl run: {e}")
+            return {}
+        
+        if checkpoint is None:
+            print(f"No crawl run to resume{f' with id {run_id}' if run_id else ''}")
+            return {}
+        if checkpoint.status == "completed":
+            print(f"Crawl run {checkpoint.run_id} already completed")
+            return {}
+        
+        params = checkpoint.params
+        self.listing_filter = checkpoint.listing_filter
+        listed = ", ".join(f"{listing.last_completed_page}/{listing.last_page or '?'}"
+                           for listing in checkpoint.listings.values())
+        
+        print(f"Resuming crawl run {checkpoint.run_id} ({checkpoint.status}): "
+              f"pages listed {listed or 'none'}, "
+              f"{len(checkpoint.done_ids)} bids saved, {len(checkpoint.pending_bids)} pending")
+        return self.process_all_bids(params["start_page"], params["end_page"], params.get("concurrency"),
+                                     params.get("incremental", False), params.get("refresh_days"),
+                                     checkpoint=checkpoint)
+    
+    def parse_cached_pages(self, pages: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Parse (html, bid_id) pairs into compact evaluations, in the worker pool when it is running"""
+        if self.parse_executor is None:
+            return [self.prepare_evaluation_for_database(self.parse_result_view_html(html_content, bid_id))
+                    for html_content, bid_id in pages]
+        html_contents, bid_ids = zip(*pages)
+        evaluations = []
+        for evaluation, metrics in self.parse_executor.map(parse_result_view_in_worker, html_contents, bid_ids,
+                                                           chunksize=4):
+            self.metrics.merge(metrics)
+            evaluations.append(evaluation)
+        return evaluations
+    
+    def reparse_cached(self, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        Rebuild bid_evaluations.evaluation from the raw result view cache, without any request.
+        Same choice as a crawl: the main view, or the single packet view when only it has evaluations
+        """
+        cache = self.get_result_cache()
+        if cache is None:
+            print("Result view cache is disabled (RESULT_CACHE_PATH), nothing to reparse")
+            return {}
+        
+        def load_ids(conn):
+            with conn.cursor() as cur:
+                cur.execute("SELECT id FROM bid_evaluations ORDER BY id")
+                return [row[0] for row in cur]
+        
+        def update(conn, rows):
+            with conn.cursor() as cur:
+                updated = psycopg2.extras.execute_values(cur, """
+                    UPDATE bid_evaluations AS b
+                    SET evaluation = v.evaluation::jsonb, updated_at = CURRENT_TIMESTAMP
+                    FROM (VALUES %s) AS v(id, evaluation)
+                    WHERE b.id = v.id
+                    RETURNING b.id, b.evaluation, b.parent_evaluation
+                """, rows, page_size=max(1, len(rows)), fetch=True)
+                self.write_participations(cur, updated)
+        
+        bid_ids = self.db.run(load_ids)
+        batch_size = batch_size or self.db_batch_size
+        stats = {"bids": len(bid_ids), "updated": 0, "not_cached": 0, "single_packet": 0}
+        print(f"Reparsing {len(bid_ids)} stored bids from {cache.path} ({cache.stats()['entries']} cached pages)")
+        started = time.monotonic()
+
+        with self.parse_workers():
+            for offset in range(0, len(bid_ids), batch_size):
+                batch = [str(bid_id) for bid_id in bid_ids[offset:offset + batch_size]]
+                main_pages = {bid_id: cache.get("getBidResultView", bid_id, touch=False) for bid_id in batch}
+                cached_ids = [bid_id for bid_id in batch if main_pages[bid_id]]
+                stats["not_cached"] += len(batch) - len(cached_ids)
+                if not cached_ids:
+                    continue
+                
+                evaluations = dict(zip(cached_ids, self.parse_cached_pages(
+                    [(main_pages[bid_id]["body"], bid_id) for bid_id in cached_ids])))
                 
-                if len(sellers) > 3:
-                    print(f"      ... and {len(sellers) - 3} more participants")
-        
-        # Display parent evaluation data if available
-        parent_evaluation_data = bid_info.get("parent_evaluation_data")
-        if parent_evaluation_data and isinstance(parent_evaluation_data, dict):
-            print(f"  PARENT BID EVALUATION:")
-            print(f"    Financial: {'Yes' if parent_evaluation_data.get('has_financial_evaluation', False) else 'No'}")
-            print(f"    Technical: {'Yes' if parent_evaluation_data.get('has_technical_evaluation', False) else 'No'}")
-            print(f"    General: {'Yes' if parent_evaluation_data.get('has_general_evaluation', False) else 'No'}")
-            
-            # Show summary of parent evaluation
-            parent_sellers = parent_evaluation_data.get('sellers_participated', [])
-            if isinstance(parent_sellers, list) and parent_sellers:
-                print(f"    Parent Total Sellers: {len(parent_sellers)}")
-                # Show top 2 parent sellers
-                for i, seller in enumerate(parent_sellers[:2]):
-                    if isinstance(seller, dict):
-                        print(f"      {seller.get('s_no', i+1)}. {seller.get('seller_name', 'Unknown')}")
-                        if 'total_price' in seller and seller['total_price']:
-                            print(f"         Price: ₹{seller.get('total_price')}")
-                        if 'rank' in seller and seller['rank']:
-                            print(f"         Rank: {seller.get('rank')}")
+                # Single packet fallback for bids whose main view has no evaluation
+                fallback = {}
+                for bid_id in cached_ids:
+                    if not self.has_any_evaluation(evaluations[bid_id]):
+                        page = cache.get("getSinglePacketResultView", bid_id, touch=False)
+                        if page:
+                            fallback[bid_id] = page["body"]
+                if fallback:
+                    for bid_id, evaluation in zip(fallback, self.parse_cached_pages(
+                            [(body, bid_id) for bid_id, body in fallback.items()])):
+                        if self.has_any_evaluation(evaluation):
+                            evaluations[bid_id] = evaluation
+                            stats["single_packet"] += 1
+                
+                rows = [(bid_id, json.dumps(evaluation)) for bid_id, evaluation in evaluations.items()]
+                self.db.run(lambda conn: update(conn, rows))
+                stats["updated"] += len(rows)
+                print(f"  ✓ Reparsed {offset + len(batch)}/{len(bid_ids)} bids")
+        
+        elapsed = time.monotonic() - started
+        print(f"\nReparse complete in {elapsed:.1f}s: {stats['updated']} updated "
+              f"({stats['single_packet']} from single packet views), {stats['not_cached']} not cached")
+        return stats
+    
+    def display_bid_info(self, bid_info: Dict[str, Any]):
+        """
+        Log a sampled DEBUG summary of a processed bid (LOG_SAMPLE_RATE of bids),
+        with every main and parent seller when log_sellers is on
+        """
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        def evaluation_fields(evaluation_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            if not evaluation_data or not isinstance(evaluation_data, dict):
+                return None
+            sellers = evaluation_data.get("sellers_participated") or []
+            fields = {
+                "financial": bool(evaluation_data.get("has_financial_evaluation")),
+                "technical": bool(evaluation_data.get("has_technical_evaluation")),
+                "general": bool(evaluation_data.get("has_general_evaluation")),
+                "sellers": len(sellers)
+            }
+            if self.log_sellers:
+                fields["seller_details"] = [
+                    {key: seller.get(key) for key in ("s_no", "seller_name", "total_price", "rank", "status",
+                                                      "evaluation_type") if seller.get(key)}
+                    for seller in sellers if isinstance(seller, dict)
+                ]
+            return fields
+        
+        log_event(logging.DEBUG, "bid", sample=not self.log_sellers,
+                  bid_id=bid_info.get("id"), bid_number=bid_info.get("b_bid_number"),
+                  category=bid_info.get("b_category_name"), quantity=bid_info.get("b_total_quantity"),
+                  status=bid_info.get("b_status"), start_date=bid_info.get("final_start_date_sort"),
+                  end_date=bid_info.get("final_end_date_sort"), ministry=bid_info.get("ba_official_details_minName"),
+                  department=bid_info.get("ba_official_details_deptName"), category_id=bid_info.get("b_cat_id"),
+                  title=bid_info.get("bbt_title"), parent_id=bid_info.get("b_id_parent"),
+                  parent_bid_number=bid_info.get("b_bid_number_parent"),
+                  evaluation_source=bid_info.get("evaluation_source"),
+                  evaluation=evaluation_fields(bid_info.get("evaluation_data")),
+                  parent_evaluation=evaluation_fields(bid_info.get("parent_evaluation_data")))
 
     def get_database_stats(self):
         """Get statistics from the database"""
         try:
-            conn = psycopg2.connect(**self.db_config)
-            cur = conn.cursor()
-            
-            # Total records
-            cur.execute("SELECT COUNT(*) FROM bid_evaluations")
-            total_records = cur.fetchone()[0]
-            
-            # Records with evaluation data
-            cur.execute("SELECT COUNT(*) FROM bid_evaluations WHERE evaluation IS NOT NULL")
-            with_evaluation = cur.fetchone()[0]
-            
-            # Records with parent evaluation data
-            cur.execute("SELECT COUNT(*) FROM bid_evaluations WHERE parent_evaluation IS NOT NULL")
-            with_parent_evaluation = cur.fetchone()[0]
-            
-            # Records with sellers participated
-            cur.execute("""
-                SELECT COUNT(*) FROM bid_evaluations 
-                WHERE evaluation->>'sellers_participated' != '[]' 
-                AND evaluation->>'sellers_participated' IS NOT NULL
-            """)
-            with_sellers = cur.fetchone()[0]
-            
-            # Top ministries
-            cur.execute("""
-                SELECT ministry_name, COUNT(*) as count 
-                FROM bid_evaluations 
-                WHERE ministry_name IS NOT NULL 
-                GROUP BY ministry_name 
-                ORDER BY count DESC 
-                LIMIT 5
-            """)
-            top_ministries = cur.fetchall()
-            
-            # Show some sample evaluation data to verify minimal storage
-            cur.execute("""
-                SELECT id, bid_number, evaluation 
-                FROM bid_evaluations 
-                WHERE evaluation IS NOT NULL 
-                LIMIT 3
-            """)
-            sample_evaluations = cur.fetchall()
-            
-            cur.close()
-            conn.close()
-            
+            with self.db.connection() as conn:
+                cur = conn.cursor()
+                
+                # Total records
+                cur.execute("SELECT COUNT(*) FROM bid_evaluations")
+                total_records = cur.fetchone()[0]
+                
+                # Records with evaluation data
+                cur.execute("SELECT COUNT(*) FROM bid_evaluations WHERE evaluation IS NOT NULL")
+                with_evaluation = cur.fetchone()[0]
+                
+                # Records with parent evaluation data
+                cur.execute("SELECT COUNT(*) FROM bid_evaluations WHERE parent_evaluation IS NOT NULL")
+                with_parent_evaluation = cur.fetchone()[0]
+                
+                # Records with sellers participated
+                cur.execute("""
+                    SELECT COUNT(*) FROM bid_evaluations 
+                    WHERE evaluation->>'sellers_participated' != '[]' 
+                    AND evaluation->>'sellers_participated' IS NOT NULL
+                """)
+                with_sellers = cur.fetchone()[0]
+                
+                # Top ministries
+                cur.execute("""
+                    SELECT ministry_name, COUNT(*) as count 
+                    FROM bid_evaluations 
+                    WHERE ministry_name IS NOT NULL 
+                    GROUP BY ministry_name 
+                    ORDER BY count DESC 
+                    LIMIT 5
+                """)
+                top_ministries = cur.fetchall()
+                
+                # Show some sample evaluation data to verify minimal storage
+                cur.execute("""
+                    SELECT id, bid_number, evaluation 
+                    FROM bid_evaluations 
+                    WHERE evaluation IS NOT NULL 
+                    LIMIT 3
+                """)
+                sample_evaluations = cur.fetchall()
+                
+                cur.close()
+                
             print(f"\n=== Database Statistics (Minimal JSON Storage) ===")
             print(f"Total Records: {total_records}")
             print(f"Records with Evaluation Data: {with_evaluation}")
@@ -971,44 +3982,186 @@ class GeMBidScraper:
         except Exception as e:
             print(f"Error getting database stats: {e}")
 
-def main():
+# Scraper instance of a parse worker process, created by init_parse_worker
+parse_worker_scraper: Optional[GeMBidScraper] = None
+
+def init_parse_worker(parser_backend: str, profile_settings: Tuple[bool, float, str, int]):
+    """Process pool initializer: a parse-only scraper without database setup"""
+    global parse_worker_scraper
+    parse_worker_scraper = GeMBidScraper(init_database=False)
+    parse_worker_scraper.parser_backend = parser_backend
+    parse_worker_scraper.parse_profiler.configure(*profile_settings)
+
+def parse_result_view_in_worker(html_content: str, bid_id: str) -> Tuple[Dict[str, Any], Dict[str, list]]:
+    """Parse one result view in a worker process, returns the compact evaluation dict and parse metrics"""
+    evaluation_data = parse_worker_scraper.parse_result_view_html(html_content, bid_id)
+    return (parse_worker_scraper.prepare_evaluation_for_database(evaluation_data),
+            parse_worker_scraper.metrics.export())
+
+# Command line subcommands; the flags that selected them before still work
+CLI_COMMANDS = ("crawl", "resume", "reparse", "stats", "backfill-participations", "migrate-partitions")
+LEGACY_COMMAND_FLAGS = {
+    "--resume": "resume",
+    "--reparse": "reparse",
+    "--backfill-participations": "backfill-participations",
+    "--migrate-partitions": "migrate-partitions"
+}
+
+def normalize_cli_args(argv: List[str]) -> List[str]:
+    """Move the subcommand to the front; without one, an old command flag picks it, otherwise crawl"""
+    if argv[:1] in (["-h"], ["--help"]):
+        return argv
+    for index, arg in enumerate(argv):
+        if arg in CLI_COMMANDS:
+            return [arg] + argv[:index] + argv[index + 1:]
+    for flag, command in LEGACY_COMMAND_FLAGS.items():
+        if flag in argv:
+            index = argv.index(flag)
+            return [command] + argv[:index] + argv[index + 1:]
+    return ["crawl"] + argv
+
+def build_cli_parser() -> argparse.ArgumentParser:
+    """Parser for the crawl, resume, reparse, stats and maintenance subcommands"""
+    parser = argparse.ArgumentParser(description="GeM bid scraper with PostgreSQL storage")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="log level (default: LOG_LEVEL or INFO)")
+    common.add_argument("--verbose", action="store_true",
+                        help="log every bid with all of its sellers at DEBUG level")
+    
+    # Options of the commands that fetch or parse result views
+    run = argparse.ArgumentParser(add_help=False, parents=[common])
+    run.add_argument("--metrics-port", type=int, metavar="PORT",
+                     help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics (default: METRICS_PORT)")
+    run.add_argument("--profile-parser", nargs="?", const=-1.0, type=float, metavar="MS",
+                     help="time each parser path and save pages slower than MS (default: "
+                          "PARSE_PROFILE_THRESHOLD_MS or 100) with a cProfile to PARSE_PROFILE_DIR")
+    
+    crawl = commands.add_parser("crawl", parents=[run], help="crawl listing pages (the default command)")
+    crawl.add_argument("--pages", nargs=2, type=int, metavar=("START", "END"),
+                       help="listing pages to crawl (asked for on a terminal, otherwise 1 to 1000)")
+    crawl.add_argument("--incremental", action="store_true",
+                       help="skip bids already stored with evaluations and stop paginating early")
+    crawl.add_argument("--end-dates", nargs=2, metavar=("FROM", "TO"),
+                       help="crawl bids ending between two YYYY-MM-DD dates, split into parallel windows")
+    crawl.add_argument("--plan", metavar="PATH",
+                       help="crawl the filter slices of a YAML or JSON crawl plan together")
+    
+    resume = commands.add_parser("resume", parents=[run], help="continue an interrupted crawl run")
+    resume.add_argument("run_id", nargs="?", default="latest",
+                        help="crawl run to continue (default: the latest unfinished one)")
+    
+    commands.add_parser("reparse", parents=[run],
+                        help="rebuild stored evaluations from the result view cache, without network access")
+    commands.add_parser("stats", parents=[common], help="show database statistics")
+    commands.add_parser("backfill-participations", parents=[common],
+                        help="fill the sellers and bid_participations tables from stored evaluations")
+    commands.add_parser("migrate-partitions", parents=[common],
+                        help="convert bid_evaluations to monthly partitions on end_date")
+    return parser
+
+def main(argv: Optional[List[str]] = None):
     """Main function to run the scraper"""
+    args = build_cli_parser().parse_args(normalize_cli_args(sys.argv[1:] if argv is None else argv))
+    
+    load_environment()
+    if args.verbose:
+        configure_logging(level="DEBUG", sample_rate=1.0)
+    elif args.log_level:
+        configure_logging(level=args.log_level)
+    
+    if args.command == "stats":
+        scraper = GeMBidScraper()
+        try:
+            scraper.get_database_stats()
+        finally:
+            scraper.db.close()
+        return
+    
     print("=== GeM Bid Scraper with PostgreSQL Storage (Minimal JSON) ===")
-    print("Note: Make sure to update cookie_value and csrf_token in the code before running!")
-    print("This version stores only essential evaluation data to reduce database size.")
+    if args.command in ("crawl", "resume"):
+        print("Note: Make sure to set GEM_COOKIE and CSRF_TOKEN before running!")
+        print("This version stores only essential evaluation data to reduce database size.")
     
-    # Initialize scraper with hardcoded values
     scraper = GeMBidScraper()
+    scraper.log_sellers = scraper.log_sellers or args.verbose
+    if getattr(args, "profile_parser", None) is not None:
+        profiler = scraper.parse_profiler
+        threshold_ms = args.profile_parser if args.profile_parser >= 0 else profiler.threshold_ms
+        profiler.configure(True, threshold_ms, profiler.capture_dir, profiler.max_captures)
+        print(f"Parser profiling: pages slower than {threshold_ms:g}ms are saved to {profiler.capture_dir}")
+    
+    metrics_port = getattr(args, "metrics_port", None)
+    metrics_port = metrics_port if metrics_port is not None else scraper.metrics_port
+    if metrics_port and args.command in ("crawl", "resume", "reparse"):
+        try:
+            scraper.metrics.serve(metrics_port)
+        except (ImportError, OSError) as e:
+            print(f"Could not start the metrics endpoint: {e}")
     
     # Test database connection
     try:
-        conn = psycopg2.connect(**scraper.db_config)
-        conn.close()
+        scraper.db.health_check()
         print("✓ Database connection successful")
     except Exception as e:
         print(f"✗ Database connection failed: {e}")
-        print("Please check your database configuration in the code")
+        print("Please check the DB_* settings in the environment or .env")
         return
     
-    # Ask user for page range (optional customization)
-    try:
-        start_page = int(input("Enter start page (default: 1): ") or "1")
-        end_page = int(input("Enter end page (default: 1000): ") or "1000")
-    except ValueError:
-        print("Invalid input, using default values: pages 1-1000")
-        start_page, end_page = 1, 1000
+    if args.command in ("reparse", "backfill-participations", "migrate-partitions"):
+        try:
+            if args.command == "reparse":
+                scraper.reparse_cached()
+            elif args.command == "backfill-participations":
+                scraper.backfill_participations()
+            else:
+                scraper.migrate_to_partitioned()
+        except KeyboardInterrupt:
+            print("\n\nInterrupted by user")
+        finally:
+            scraper.db.close()
+        return
+    
+    if args.command == "crawl" and not args.plan:
+        start_page, end_page = args.pages or (1, 1000)
+        incremental = args.incremental
+        if args.pages is None and sys.stdin.isatty():
+            # Ask user for page range (optional customization)
+            try:
+                start_page = int(input("Enter start page (default: 1): ") or "1")
+                end_page = int(input("Enter end page (default: 1000): ") or "1000")
+            except ValueError:
+                print("Invalid input, using default values: pages 1-1000")
+                start_page, end_page = 1, 1000
+            
+            if not incremental:
+                incremental = input("Skip bids already stored with evaluations? (y/N): ").strip().lower() == "y"
     
     # Run the scraper
     try:
-        bid_data = scraper.process_all_bids(start_page, end_page)
+        if args.command == "resume":
+            scraper.resume_crawl(None if args.run_id == "latest" else args.run_id)
+        elif args.plan:
+            scraper.run_crawl_plan(args.plan)
+        else:
+            scraper.process_all_bids(start_page, end_page, incremental=incremental, end_date_range=args.end_dates)
         
         # Show final database statistics
         scraper.get_database_stats()
         
     except KeyboardInterrupt:
         print("\n\nScraping interrupted by user")
+        print("Progress is checkpointed, continue with: python working.py resume")
     except Exception as e:
         print(f"\nError during scraping: {e}")
+    finally:
+        print(f"Database pool: {scraper.db.stats()}")
+        scraper.db.close()
+        if scraper.result_cache:
+            print(f"Result view cache: {scraper.result_cache.stats()}")
+            scraper.result_cache.close()
     
     print("\n=== Scraping Complete ===")
     print("Data has been saved to PostgreSQL database with minimal JSON structure")
@@ -1023,15 +4176,15 @@ def main():
     print("- raw_html_length, extraction_method, has_sellers_list metadata")
 
 if __name__ == "__main__":
-    # Install required packages check
-    try:
-        import psycopg2
-        from bs4 import BeautifulSoup
-        print("✓ All required packages available")
-    except ImportError as e:
-        print(f"✗ Missing required package: {e}")
+    # Required packages check, without importing them (quick commands never load most of them)
+    missing = [package for module, package in (("psycopg2", "psycopg2-binary"), ("requests", "requests"),
+                                               ("aiohttp", "aiohttp"), ("bs4", "beautifulsoup4"),
+                                               ("dotenv", "python-dotenv"))
+               if importlib.util.find_spec(module) is None]
+    if missing:
+        print(f"✗ Missing required packages: {', '.join(missing)}")
         print("Please install with:")
-        print("pip install psycopg2-binary beautifulsoup4 lxml requests")
+        print(f"pip install {' '.join(missing)}")
         exit(1)
     
     main()